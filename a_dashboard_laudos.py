@@ -1,89 +1,195 @@
 """Dashboard para visualização de dados de laudos de supervisão ocupacional - Meta 2.1"""
 
-import unicodedata
 from datetime import datetime
 
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
+from carregador_dados import carregar_planilha, rotulo_versao, versao_planilha
+from cubo import caminho_cubo, contar, ler_cubo, montar_cubo
+from filtros import (TODOS, aplicar_filtros, contar_periodo, indice_cacheado,
+                     indice_datas_cacheado, mascara_periodo)
+from graficos import figura_barras, figura_pizza
+from progresso import barra_progresso, progresso_planilha
+from tabela import tabela_paginada
+from texto import remover_acentos
 
-# Use o decorador st.cache_data para armazenar em cache o carregamento dos dados
-@st.cache_data
-def load_data(file_path):
-    """Carrega os dados do arquivo Excel e armazena em cache."""
-    # Carregar os dados do Excel
-    df = pd.read_excel(file_path)
-    return df
 
+# Colunas usadas nos filtros, armazenadas como categorias
+CATEGORICAL_COLUMNS = [
+    'Técnico', 'Município', 'Assentamento',
+    'Tipo de Laudo', 'Modalidade', 'Código SIPRA'
+]
 
-def show_dashboard():
-    """Exibe o dashboard com os dados de laudos."""
-    # Função para remover caracteres especiais e normalizar texto
-    def remove_special_chars(text):
-        if not isinstance(text, str):
-            return text  # Retorna o valor original se não for uma string
-        return ''.join(ch for ch in unicodedata.normalize('NFKD', text) 
-                      if not unicodedata.combining(ch))
+# Colunas do cubo de contagens publicado pelo backend: as dos gráficos e a
+# data reduzida ao mês. Técnico e Código SIPRA ficam de fora; com eles
+# selecionados, os gráficos são contados nos laudos filtrados.
+CUBE_DIMENSIONS = ['Município', 'Assentamento', 'Tipo de Laudo', 'Modalidade', 'Data']
+CUBE_MONTHLY_COLUMNS = ['Data']
+CUBE_FILTER_COLUMNS = tuple(
+    column for column in CATEGORICAL_COLUMNS if column in CUBE_DIMENSIONS)
 
-    # Caminho do arquivo Excel
-    file_path = "01_laudos_SO_infos.xlsx"
 
-    # Carregar os dados usando a função cacheada
-    df = load_data(file_path)
+def prepare_data(df):
+    """Limpa e tipa os dados brutos da planilha de laudos."""
+    df = df.copy()
 
-    # Preencher valores vazios na coluna 'Modalidade' com 'Desconhecido'
+    # Preencher valores vazios com 'Desconhecido'
     df['Modalidade'] = df['Modalidade'].fillna('Desconhecido')
-
-    # Preencher valores nulos na coluna 'Município' com 'Desconhecido'
     df['Município'] = df['Município'].fillna('Desconhecido')
 
-    # Aplicar a função para remover caracteres especiais na coluna 'Município'
-    df['Município'] = df['Município'].map(remove_special_chars)
+    # Remover caracteres especiais na coluna 'Município'
+    df['Município'] = remover_acentos(df['Município'])
 
     # Converter coluna de data
     df['Data'] = pd.to_datetime(df['Data'], format='%d/%m/%Y')
 
-    # Definir título do aplicativo
-    st.header("Produtos da meta 2.1")
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    return df
+
 
-    # Calcular total de laudos por modalidade
-    total_vistoria = len(df[df['Modalidade'] == 'VISTORIA IN LOCO'])
-    total_mutirao = len(df[df['Modalidade'] == 'MUTIRÃO'])
+# O DataFrame preparado é compartilhado entre reruns e sessões sem cópia
+# (compartilhada=True) e não deve ser modificado: a aba só o lê pelos
+# filtros, que retornam sempre um DataFrame novo. A versão do arquivo faz
+# parte da chave, então uma planilha nova é preparada de novo.
+def load_prepared_data(file_path, version):
+    """Carrega e prepara os dados uma única vez por versão do arquivo."""
+    return carregar_planilha(file_path, version, prepare_data, compartilhada=True)
+
+
+def add_year_month(cube):
+    """Acrescenta ao cubo as colunas 'Ano' e 'Mês' da data."""
+    cube['Ano'] = cube['Data'].dt.year
+    cube['Mês'] = cube['Data'].dt.month
+    return cube
+
+
+@st.cache_resource(max_entries=2)
+def load_prepared_cube(file_path, version):
+    """Carrega e prepara o cubo de contagens, como os dados, com ano e mês."""
+    return add_year_month(prepare_data(
+        ler_cubo(file_path, CUBE_DIMENSIONS, CUBE_MONTHLY_COLUMNS)))
+
+
+@st.cache_resource(max_entries=2)
+def load_filter_options(file_path, version):
+    """Opções ordenadas de cada filtro ('Todos' + categorias da coluna)."""
+    df = load_prepared_data(file_path, version)
+    return {
+        column: ['Todos'] + sorted(df[column].cat.categories)
+        for column in CATEGORICAL_COLUMNS
+    }
+
+
+def count_values(cube, column):
+    """Contagem por valor, sem as categorias que não aparecem no filtro."""
+    counts = contar(cube, column)
+    counts = counts[counts > 0]
+    counts.index = counts.index.astype(str)
+    return counts
+
+
+def filter_data(file_path, version, selections, start_date, end_date, cube=False):
+    """Laudos (ou linhas do cubo) nos filtros ((coluna, valor), ...) e no período."""
+    if cube:
+        df = load_prepared_cube(file_path, version)
+        source = caminho_cubo(file_path)
+        columns = CUBE_FILTER_COLUMNS
+    else:
+        df = load_prepared_data(file_path, version)
+        source = file_path
+        columns = tuple(CATEGORICAL_COLUMNS)
+    indice = indice_cacheado(source, version, columns, df)
+    datas = indice_datas_cacheado(source, version, 'Data', df)
+    return aplicar_filtros(
+        df, dict(selections), indice, mascara_periodo(datas, start_date, end_date))
+
+
+def month_period(start_date, end_date):
+    """Primeiro dia do mês de `start_date` e último dia do mês de `end_date`."""
+    return (pd.Timestamp(start_date).replace(day=1).date(),
+            (pd.Timestamp(end_date) + pd.offsets.MonthEnd(0)).date())
+
+
+def cube_answers(file_path, version, selections, start_date, end_date):
+    """Indica se o cubo (por mês) responde exatamente aos filtros.
+
+    Não responde se houver seleção numa coluna fora do cubo ou se o
+    período cortar um mês com laudos fora dele; as duas verificações usam
+    só as seleções e buscas binárias nas datas, sem percorrer os laudos.
+    """
+    if any(value != TODOS for column, value in selections
+           if column not in CUBE_DIMENSIONS):
+        return False
+    df = load_prepared_data(file_path, version)
+    datas = indice_datas_cacheado(file_path, version, 'Data', df)
+    return (contar_periodo(datas, *month_period(start_date, end_date))
+            == contar_periodo(datas, start_date, end_date))
+
+
+# Contagens dos gráficos por combinação de filtros, compartilhadas entre
+# sessões. As combinações menos usadas recentemente saem do cache primeiro.
+@st.cache_data(max_entries=64)
+def load_aggregates(file_path, version, selections, start_date, end_date):
+    """Contagens por município, por tipo de laudo e por ano/mês, somadas no cubo.
+
+    Quando o cubo publicado não responde aos filtros (ver `cube_answers`),
+    o cubo é montado a partir dos laudos filtrados.
+    """
+    if cube_answers(file_path, version, selections, start_date, end_date):
+        cube = filter_data(file_path, version, selections,
+                           month_period(start_date, end_date)[0], end_date, cube=True)
+    else:
+        df = filter_data(file_path, version, selections, start_date, end_date)
+        cube = add_year_month(montar_cubo(
+            df.assign(Data=df['Data'].dt.to_period('M').dt.to_timestamp()),
+            CUBE_DIMENSIONS))
+    por_ano_mes = cube.groupby(['Ano', 'Mês'])['Quantidade'].sum().unstack(fill_value=0)
+    return {
+        'Município': count_values(cube, 'Município'),
+        'Tipo de Laudo': count_values(cube, 'Tipo de Laudo'),
+        'Mês': por_ano_mes.reindex(columns=range(1, 13), fill_value=0),
+    }
 
-    # Meta total para cada modalidade
-    meta_vistoria = 4739
-    meta_mutirao = 2746
 
-    # Calcular percentuais
-    percentual_vistoria = (total_vistoria / meta_vistoria) * 100
-    percentual_mutirao = (total_mutirao / meta_mutirao) * 100
+def show_dashboard():
+    """Exibe o dashboard com os dados de laudos."""
+    # Caminho do arquivo Excel
+    file_path = "01_laudos_SO_infos.xlsx"
+
+    # Carregar as opções dos filtros (calculadas uma vez por versão)
+    version = versao_planilha(file_path)
+    options = load_filter_options(file_path, version)
 
-    # Exibir barras de progresso
+    # Definir título do aplicativo
+    st.header("Produtos da meta 2.1")
+    st.caption(f"Dados: {rotulo_versao(file_path)}")
+
+    # Progresso das metas: retrato publicado pelo backend ou, se ele for de
+    # outra versão da planilha, contado nos dados carregados
+    progresso = progresso_planilha(file_path, version, load_prepared_data(file_path, version))
     st.subheader("Progresso dos Laudos")
 
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown("**2.1.1 Vistoria in loco**")
-        st.progress(min(percentual_vistoria/100, 1.0))
-        st.write(f"{total_vistoria} de {meta_vistoria} laudos ({percentual_vistoria:.1f}%)")
+        barra_progresso(progresso, '2.1.1')
 
     with col2:
-        st.markdown("**2.1.2 Mutirão**")
-        st.progress(min(percentual_mutirao/100, 1.0))
-        st.write(f"{total_mutirao} de {meta_mutirao} laudos ({percentual_mutirao:.1f}%)")
+        barra_progresso(progresso, '2.1.2')
 
     # Definir título da tabela com informações gerais sobre os laudos
     st.subheader("Relação de laudos")
 
-    # Ordenar opções de pesquisa
-    tecnicos = ['Todos'] + sorted(list(df['Técnico'].unique()))
-    assentamentos = ['Todos'] + sorted(list(df['Assentamento'].unique()))
-    tipos_de_laudo = ['Todos'] + sorted(list(df['Tipo de Laudo'].unique()))
-    municipios = ['Todos'] + sorted(list(df['Município'].unique()))
-    modalidade = ['Todos'] + sorted(list(df['Modalidade'].unique()))
-    codigos_sipra = ['Todos'] + sorted(list(df['Código SIPRA'].unique()))
+    # Opções de pesquisa ordenadas (calculadas uma vez por versão)
+    tecnicos = options['Técnico']
+    assentamentos = options['Assentamento']
+    tipos_de_laudo = options['Tipo de Laudo']
+    municipios = options['Município']
+    modalidade = options['Modalidade']
+    codigos_sipra = options['Código SIPRA']
 
     # Data inicial padrão: 01/01/2022
     start_date = datetime(2022, 1, 1).date()
@@ -104,56 +210,40 @@ def show_dashboard():
         "Selecione uma modalidade:", modalidade, key="modalidade")
     selected_codigo_sipra = st.sidebar.selectbox(
         "Selecione um Código SIPRA:", codigos_sipra, key="codigo_sipra")
+    # Datas padrão definidas no session_state, onde main.py mantém as
+    # seleções ao trocar de aba
+    st.session_state.setdefault("start_date", start_date)
+    st.session_state.setdefault("end_date", end_date)
+    start_date = st.sidebar.date_input("Data inicial:", key="start_date")
+    end_date = st.sidebar.date_input("Data final:", key="end_date")
+
+    # Filtrar pelas seleções (uma única máscara combinada) e por data
+    selections = (
+        ('Técnico', selected_tecnico),
+        ('Município', selected_municipio),
+        ('Assentamento', selected_assentamento),
+        ('Tipo de Laudo', selected_tipo_laudo),
+        ('Modalidade', selected_modalidade),
+        ('Código SIPRA', selected_codigo_sipra),
+    )
+    df = filter_data(file_path, version, selections, start_date, end_date)
+    aggregates = load_aggregates(
+        file_path, version, selections, start_date, end_date)
 
-    # Filtrar por técnico
-    if selected_tecnico != "Todos":
-        df = df[df['Técnico'] == selected_tecnico]
-
-    # Filtrar por município
-    if selected_municipio != "Todos":
-        df = df[df['Município'] == selected_municipio]
-
-    # Filtrar por assentamento
-    if selected_assentamento != "Todos":
-        df = df[df['Assentamento'] == selected_assentamento]
-
-    # Filtrar por tipo de laudo
-    if selected_tipo_laudo != "Todos":
-        df = df[df['Tipo de Laudo'] == selected_tipo_laudo]
-
-    # Filtrar por modalidade
-    if selected_modalidade != "Todos":
-        df = df[df['Modalidade'] == selected_modalidade]
-
-    # Filtrar por Código SIPRA
-    if selected_codigo_sipra != "Todos":
-        df = df[df['Código SIPRA'] == selected_codigo_sipra]
-
-    # Filtrar por data
-    start_date = st.sidebar.date_input(
-        "Data inicial:", start_date, key="start_date")
-    end_date = st.sidebar.date_input(
-        "Data final:", end_date, key="end_date")
-    df = df[(df['Data'].dt.date >= start_date) & (df['Data'].dt.date <= end_date)]
-
-    # Exibir tabela interativa
-    st.write(df)
+    # Exibir tabela interativa (paginada)
+    tabela_paginada(df, 'laudos')
 
     # Gráfico de pizza - Distribuição por município
     st.subheader("Distribuição de Laudos por Município")
-    municipio_data = df['Município'].value_counts()
-    fig_municipio = px.pie(
-        names=municipio_data.index,
-        values=municipio_data.values,
-        title='Distribuição dos Laudos por Município'
-    )
-    st.plotly_chart(fig_municipio)
+    municipio_data = aggregates['Município']
+    fig_municipio = figura_pizza(
+        municipio_data, 'Distribuição dos Laudos por Município')
+    st.plotly_chart(fig_municipio, key="laudos_municipio")
 
     # Gráfico de barras por mês com seletor de ano
     st.subheader("Quantidade de Laudos por Mês")
 
     # Adicionar seletor de ano
-    anos_disponiveis = sorted(df['Data'].dt.year.unique())
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
@@ -173,43 +263,38 @@ def show_dashboard():
     if 'ano_selecionado' not in locals():
         ano_selecionado = datetime.now().year
 
-    # Filtrar dados pelo ano selecionado
-    df_ano = df[df['Data'].dt.year == ano_selecionado]
-
-    # Criar gráfico de barras mensal
-    laudos_por_mes = df_ano.groupby(df_ano['Data'].dt.month).size().reindex(
-        range(1, 13), fill_value=0)
+    # Laudos do ano selecionado por mês
+    laudos_por_ano_mes = aggregates['Mês']
+    if ano_selecionado in laudos_por_ano_mes.index:
+        laudos_por_mes = laudos_por_ano_mes.loc[ano_selecionado]
+    else:
+        laudos_por_mes = pd.Series(0, index=range(1, 13))
 
     # Converter números dos meses para nomes
     meses = ['Jan', 'Fev', 'Mar', 'Abr', 'Mai', 'Jun', 
              'Jul', 'Ago', 'Set', 'Out', 'Nov', 'Dez']
     laudos_por_mes.index = meses
 
-    fig_mensal = px.bar(
-        x=laudos_por_mes.index,
-        y=laudos_por_mes.values,
-        title=f'Quantidade de Laudos por Mês em {ano_selecionado}',
+    fig_mensal = figura_barras(
+        laudos_por_mes,
+        f'Quantidade de Laudos por Mês em {ano_selecionado}',
         labels={'x': 'Mês', 'y': 'Quantidade de Laudos'}
     )
-    st.plotly_chart(fig_mensal)
+    st.plotly_chart(fig_mensal, key="laudos_mensal")
 
     # Gráfico de barras - tipo de laudo
     st.subheader("Gráfico de barras - tipo de laudo")
-    chart_data = df['Tipo de Laudo'].value_counts()
+    chart_data = aggregates['Tipo de Laudo']
     st.bar_chart(chart_data)
 
     # Gráfico de pizza - tipo de laudo
     st.subheader("Gráfico de pizza - tipo de laudo")
-    pie_chart_data = df['Tipo de Laudo'].value_counts()
-    fig = px.pie(
-        names=pie_chart_data.index, 
-        values=pie_chart_data.values, 
-        title='Distribuição dos Laudos'
-    )
-    st.plotly_chart(fig)
+    pie_chart_data = aggregates['Tipo de Laudo']
+    fig = figura_pizza(pie_chart_data, 'Distribuição dos Laudos')
+    st.plotly_chart(fig, key="laudos_tipo")
 
     # Calcular o total de laudos para cada tipo de laudo
-    total_por_tipo_laudo = df['Tipo de Laudo'].value_counts()
+    total_por_tipo_laudo = aggregates['Tipo de Laudo']
 
     # Calcular o total de laudos
     total_de_laudos = total_por_tipo_laudo.sum()
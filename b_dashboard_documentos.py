@@ -1,25 +1,93 @@
 """Dashboard para visualização de produtos da meta 2.2 - Documentação PGT."""
 
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from carregador_dados import carregar_planilha, rotulo_versao, versao_planilha
+from cubo import caminho_cubo, contar, ler_cubo, montar_cubo
+from filtros import TODOS, aplicar_filtros, indice_cacheado
+from graficos import figura_pizza
+from progresso import barra_progresso, progresso_planilha
+from tabela import tabela_paginada
 
-@st.cache_data
-def load_data():
-    """Carrega os dados do arquivo Excel e armazena em cache."""
-    return pd.read_excel('02_contPGT.xlsx')
+FILE_PATH = '02_contPGT.xlsx'
 
+# Colunas do cubo de contagens publicado pelo backend. Nome T1 fica de fora
+# (quase um valor por documento); com ele selecionado, os gráficos são
+# contados nos documentos filtrados.
+CUBE_DIMENSIONS = ['Tipo de documento PGT', 'Assentamento', 'Município', 'Objetivo']
 
-def show_dashboard():
-    """Exibe o dashboard com os dados de documentação PGT."""
-    st.header("Produtos da meta 2.2")
-    df_pgt = load_data()
 
+def prepare_data(df_pgt):
+    """Preenche os objetivos vazios com 'Não especificado'."""
     # Correção do chained assignment
     if 'Objetivo' in df_pgt.columns:
         df_pgt['Objetivo'] = df_pgt['Objetivo'].fillna('Não especificado')
+    return df_pgt
+
+
+def load_data(version):
+    """Carrega os dados da planilha (Parquet, se houver), preparados uma vez por versão."""
+    return carregar_planilha(FILE_PATH, version, prepare_data)
+
+
+@st.cache_resource(max_entries=2)
+def load_cube(version, dimensoes):
+    """Carrega o cubo de contagens (somente leitura), com a mesma correção dos dados."""
+    cubo = ler_cubo(FILE_PATH, dimensoes)
+    if 'Objetivo' in cubo.columns:
+        cubo['Objetivo'] = cubo['Objetivo'].fillna('Não especificado')
+    return cubo
+
+
+def filter_data(version, selecoes, cube=False):
+    """Documentos (ou linhas do cubo) que atendem aos filtros ((coluna, valor), ...)."""
+    colunas = tuple(coluna for coluna, _ in selecoes)
+    if cube:
+        colunas = tuple(coluna for coluna in colunas if coluna in CUBE_DIMENSIONS)
+        df_pgt = load_cube(version, colunas)
+        origem = caminho_cubo(FILE_PATH)
+    else:
+        df_pgt = load_data(version)
+        origem = FILE_PATH
+    indice = indice_cacheado(origem, version, colunas, df_pgt)
+    return aplicar_filtros(df_pgt, dict(selecoes), indice)
+
+
+# Contagens dos gráficos por combinação de filtros, compartilhadas entre
+# sessões. As combinações menos usadas recentemente saem do cache primeiro.
+@st.cache_data(max_entries=64)
+def load_aggregates(version, selecoes):
+    """Contagens por tipo, assentamento, município, objetivo e tipo x assentamento.
+
+    As contagens são somas da coluna 'Quantidade' do cubo filtrado. Com uma
+    seleção em coluna fora do cubo, o cubo é montado a partir dos
+    documentos filtrados.
+    """
+    if all(valor == TODOS for coluna, valor in selecoes if coluna not in CUBE_DIMENSIONS):
+        cubo = filter_data(version, selecoes, cube=True)
+    else:
+        df_pgt = filter_data(version, selecoes)
+        cubo = montar_cubo(df_pgt, [coluna for coluna in CUBE_DIMENSIONS
+                                    if coluna in df_pgt.columns])
+    aggregates = {
+        coluna: contar(cubo, coluna)
+        for coluna in ['Tipo de documento PGT', 'Assentamento', 'Município']
+    }
+    if 'Objetivo' in cubo.columns:
+        aggregates['Objetivo'] = contar(cubo, 'Objetivo')
+    aggregates['Tipo x Assentamento'] = cubo.groupby(
+        ['Tipo de documento PGT', 'Assentamento']
+    )['Quantidade'].sum().reset_index(name='Quantidade de Documentos')
+    return aggregates
+
+
+def show_dashboard():
+    """Exibe o dashboard com os dados de documentação PGT."""
+    st.header("Produtos da meta 2.2")
+    st.caption(f"Dados: {rotulo_versao(FILE_PATH)}")
+    version = versao_planilha(FILE_PATH)
+    df_pgt = load_data(version)
 
     if 'Município' not in df_pgt.columns:
         st.error("A coluna 'Município' não está presente nos dados.")
@@ -63,121 +131,52 @@ def show_dashboard():
         key="objetivo_pgt_unique"
     )
 
-    # Aplicar filtros
-    filtered_df = df_pgt.copy()
-    if selected_tipo_documento != "Todos":
-        filtered_df = filtered_df[
-            filtered_df['Tipo de documento PGT'] == selected_tipo_documento
-        ]
-    if selected_assentamento != "Todos":
-        filtered_df = filtered_df[
-            filtered_df['Assentamento'] == selected_assentamento
-        ]
-    if selected_municipio != "Todos":
-        filtered_df = filtered_df[
-            filtered_df['Município'] == selected_municipio
-        ]
-    if selected_nome_t1 != "Todos":
-        filtered_df = filtered_df[
-            filtered_df['Nome T1'] == selected_nome_t1
-        ]
-    if selected_objetivo != "Todos" and 'Objetivo' in filtered_df.columns:
-        filtered_df = filtered_df[
-            filtered_df['Objetivo'] == selected_objetivo
-        ]
+    # Aplicar filtros (uma única máscara combinada)
+    selecoes = [
+        ('Tipo de documento PGT', selected_tipo_documento),
+        ('Assentamento', selected_assentamento),
+        ('Município', selected_municipio),
+        ('Nome T1', selected_nome_t1),
+    ]
+    if 'Objetivo' in df_pgt.columns:
+        selecoes.append(('Objetivo', selected_objetivo))
+    selecoes = tuple(selecoes)
+    filtered_df = filter_data(version, selecoes)
+    aggregates = load_aggregates(version, selecoes)
 
     # Barras de Progresso
     st.subheader("Progresso da Documentação")
 
-    # Calcular totais e percentuais
-    relatorios_conf_atual = len(df_pgt[
-        df_pgt['Tipo de documento PGT'] == 'Relatório de conformidades para regularização'
-    ])
-    solicitacoes_atual = len(df_pgt[
-        df_pgt['Tipo de documento PGT'] == 'Solicitação de documentação complementar'
-    ])
-    segundos_relatorios_atual = len(df_pgt[
-        df_pgt['Tipo de documento PGT'].str.contains('2º Relatório', na=False)
-    ])
-    analise_reg_atual = len(df_pgt[
-        df_pgt['Tipo de documento PGT'] == 'Análise para regularização'
-    ])
-
-    # Definir metas
-    total_relatorios_conf = 2246
-    total_solicitacoes = 674
-    total_segundos_relatorios = 337
-    total_analise_reg = 1622
-
-    # Calcular percentuais
-    percentual_relatorios_conf = (relatorios_conf_atual / total_relatorios_conf) * 100
-    percentual_solicitacoes = (solicitacoes_atual / total_solicitacoes) * 100
-    percentual_segundos_relatorios = (
-        segundos_relatorios_atual / total_segundos_relatorios
-    ) * 100
-    percentual_analise_reg = (analise_reg_atual / total_analise_reg) * 100
-
-    # Exibir barras de progresso em ordem
-    st.markdown("**2.2.1. Relatório de conformidades para regularização**")
-    st.progress(min(percentual_relatorios_conf/100, 1.0))
-    st.write(
-        f"{relatorios_conf_atual} de {total_relatorios_conf} documentos "
-        f"({percentual_relatorios_conf:.1f}%)"
-    )
-
-    st.markdown("**2.2.2. Solicitação de documentação complementar**")
-    st.progress(min(percentual_solicitacoes/100, 1.0))
-    st.write(
-        f"{solicitacoes_atual} de {total_solicitacoes} documentos "
-        f"({percentual_solicitacoes:.1f}%)"
-    )
-
-    st.markdown("**2.2.3. Segundos relatórios de conformidades para regularização**")
-    st.progress(min(percentual_segundos_relatorios/100, 1.0))
-    st.write(
-        f"{segundos_relatorios_atual} de {total_segundos_relatorios} documentos "
-        f"({percentual_segundos_relatorios:.1f}%)"
-    )
-
-    st.markdown("**2.2.4. Análise para regularização**")
-    st.progress(min(percentual_analise_reg/100, 1.0))
-    st.write(
-        f"{analise_reg_atual} de {total_analise_reg} documentos "
-        f"({percentual_analise_reg:.1f}%)"
-    )
+    # Progresso das metas: retrato publicado pelo backend ou, se ele for de
+    # outra versão da planilha, contado nos dados carregados (sem filtros)
+    progresso = progresso_planilha(FILE_PATH, version, df_pgt)
+    for codigo in ('2.2.1', '2.2.2', '2.2.3', '2.2.4'):
+        barra_progresso(progresso, codigo)
 
     # Resto do dashboard permanece igual
     st.markdown("### Distribuição dos documentos por tipo")
-    tipo_documento_data = filtered_df['Tipo de documento PGT'].value_counts()
-    fig_tipo_documento = px.pie(
-        names=tipo_documento_data.index,
-        values=tipo_documento_data.values,
-    )
-    st.plotly_chart(fig_tipo_documento)
+    tipo_documento_data = aggregates['Tipo de documento PGT']
+    fig_tipo_documento = figura_pizza(tipo_documento_data)
+    st.plotly_chart(fig_tipo_documento, key="pgt_tipo")
 
     st.markdown("### Distribuição dos documentos por assentamento")
-    assentamento_data = filtered_df['Assentamento'].value_counts()
+    assentamento_data = aggregates['Assentamento']
     st.bar_chart(assentamento_data)
 
     st.markdown("### Distribuição dos documentos por município")
-    municipio_data = filtered_df['Município'].value_counts()
-    fig_municipio = px.pie(
-        names=municipio_data.index,
-        values=municipio_data.values,
-    )
-    st.plotly_chart(fig_municipio)
+    municipio_data = aggregates['Município']
+    fig_municipio = figura_pizza(municipio_data)
+    st.plotly_chart(fig_municipio, key="pgt_municipio")
 
     if 'Objetivo' in filtered_df.columns:
         st.markdown("### Distribuição dos documentos por objetivo")
-        objetivo_data = filtered_df['Objetivo'].value_counts()
+        objetivo_data = aggregates['Objetivo']
         st.bar_chart(objetivo_data)
 
     st.markdown("### Relação geral da documentação")
-    st.write(filtered_df)
+    tabela_paginada(filtered_df, 'pgt')
 
-    total_por_tipo_assentamento = filtered_df.groupby(
-        ['Tipo de documento PGT', 'Assentamento']
-    ).size().reset_index(name='Quantidade de Documentos')
+    total_por_tipo_assentamento = aggregates['Tipo x Assentamento']
 
     st.markdown("### Quantidade de documentos por tipo e assentamento")
     st.write(total_por_tipo_assentamento)
@@ -1,10 +1,31 @@
 """Módulo para extração de informações de laudos em PDFs."""
 
+import argparse
 import os
 import re
+import sys
+import timeit
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
 import pandas as pd
 import PyPDF2
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extracao_pdf import AUSENTE, CacheExtracao, DocumentoPDF  # noqa: E402
+from publicacao import publicar_parquet  # noqa: E402
+from referencia_pas import ReferenciaPAs  # noqa: E402
+
+# Prefixo dos campos derivados no cache de extração; altere ao mudar os extratores
+PREFIXO_CAMPOS = 'laudos_v1'
+
+# Colunas do cubo de contagens usado pelos gráficos do dashboard, com a data
+# reduzida ao mês; Técnico e Código SIPRA ficam de fora para que o cubo não
+# cresça com o número de laudos
+DIMENSOES_CUBO = [
+    'Município', 'Assentamento', 'Tipo de Laudo', 'Modalidade', 'Data'
+]
+COLUNAS_MENSAIS_CUBO = ['Data']
+
 
 def carregar_padronizacao_tecnicos(csv_path):
     """Carrega o dicionário de padronização dos nomes dos técnicos de um CSV."""
@@ -45,62 +66,57 @@ def extrair_data(texto):
     return None
 
 
-def extrair_data_pdf(caminho_pdf):
+def extrair_data_pdf(documento):
     """Extrai a data de um PDF."""
-    with open(caminho_pdf, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        num_paginas = len(reader.pages)
-        texto_ultima_pagina = reader.pages[num_paginas - 1].extract_text()
-        padrao = r"Documento assinado eletronicamente por "
-        texto_apos_padrao = extrair_texto_apos_padrao(texto_ultima_pagina, padrao)
-        if texto_apos_padrao:
-            return extrair_data(texto_apos_padrao)
+    padrao = r"Documento assinado eletronicamente por "
+    texto_apos_padrao = extrair_texto_apos_padrao(
+        documento.texto_ultima_pagina, padrao)
+    if texto_apos_padrao:
+        return extrair_data(texto_apos_padrao)
     return None
 
 
-def extrair_tecnico_pdf(caminho_pdf):
+def extrair_tecnico_pdf(documento):
     """Extrai o nome do técnico de um PDF."""
-    with open(caminho_pdf, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        num_paginas = len(reader.pages)
-        texto_ultima_pagina = reader.pages[num_paginas - 1].extract_text()
-        padrao = r"Documento assinado eletronicamente por (.+?)\d"
-        resultado = re.search(padrao, texto_ultima_pagina)
-        if resultado:
-            nome_tecnico = resultado.group(1).strip()
-            return nome_tecnico
+    padrao = r"Documento assinado eletronicamente por (.+?)\d"
+    resultado = re.search(padrao, documento.texto_ultima_pagina)
+    if resultado:
+        nome_tecnico = resultado.group(1).strip()
+        return nome_tecnico
     return None
 
 
-def extrair_assentamento_pdf(caminho_pdf):
+def extrair_assentamento_pdf(documento):
     """Extrai o assentamento de um PDF."""
-    with open(caminho_pdf, 'rb') as file:
-        reader = PyPDF2.PdfReader(file)
-        texto_primeira_pagina = reader.pages[0].extract_text()
-        padrao = r"PA\s*(.+?)\s*PR0"
-        resultado = re.search(padrao, texto_primeira_pagina)
-        if resultado:
-            return resultado.group(1).strip()
+    padrao = r"PA\s*(.+?)\s*PR0"
+    resultado = re.search(padrao, documento.texto_primeira_pagina)
+    if resultado:
+        return resultado.group(1).strip()
     return None
 
 
+# Tipos de laudo pelo trecho do nome do arquivo, em ordem de prioridade
+TIPOS_LAUDO = {
+    'DecBeneficiario': 'Laudo Declaração de Beneficiário',
+    'SimpBeneficiario': 'Laudo Simplificado de Beneficiário',
+    'CompBeneficiario': 'Laudo Completo de Beneficiário',
+    'DecOcupante': 'Laudo Declaração de Ocupante',
+    'SimpOcupante': 'Laudo Simplificado de Ocupante',
+    'CompOcupante': 'Laudo Completo de Ocupante',
+    'LoteVago': 'Laudo Lote Vago',
+}
+PRIORIDADE_TRECHOS = {trecho: i for i, trecho in enumerate(TIPOS_LAUDO)}
+
+# Expressão única que reconhece qualquer um dos trechos em uma só varredura
+PADRAO_TIPO_LAUDO = re.compile('|'.join(map(re.escape, TIPOS_LAUDO)))
+
+
 def verificar_tipo_laudo(nome_arquivo):
     """Verifica o tipo de laudo com base no nome do arquivo."""
-    if 'DecBeneficiario' in nome_arquivo:
-        return 'Laudo Declaração de Beneficiário'
-    elif 'SimpBeneficiario' in nome_arquivo:
-        return 'Laudo Simplificado de Beneficiário'
-    elif 'CompBeneficiario' in nome_arquivo:
-        return 'Laudo Completo de Beneficiário'
-    elif 'DecOcupante' in nome_arquivo:
-        return 'Laudo Declaração de Ocupante'
-    elif 'SimpOcupante' in nome_arquivo:
-        return 'Laudo Simplificado de Ocupante'
-    elif 'CompOcupante' in nome_arquivo:
-        return 'Laudo Completo de Ocupante'
-    elif 'LoteVago' in nome_arquivo:
-        return 'Laudo Lote Vago'
-    return None
+    trechos = PADRAO_TIPO_LAUDO.findall(nome_arquivo)
+    if not trechos:
+        return None
+    return TIPOS_LAUDO[min(trechos, key=PRIORIDADE_TRECHOS.__getitem__)]
 
 
 def extrair_lxx(nome_arquivo):
@@ -132,95 +148,324 @@ def carregar_datas(csv_path):
     return datas_mtr, datas_vl
 
 
-def carregar_municipios(csv_path):
-    """Carrega o mapeamento de assentamentos para municípios e códigos SIPRA."""
-    df = pd.read_csv(csv_path)
-    municipios_map = dict(zip(df['Assentamento'], df['Município']))
-    codsipra_map = dict(zip(df['Assentamento'], df['Codsipra']))
-    return municipios_map, codsipra_map
+def montar_tabela_modalidades(datas_mtr, datas_vl):
+    """Monta o dicionário data -> modalidade (mutirão tem prioridade)."""
+    modalidades = {data: "VISTORIA IN LOCO" for data in datas_vl}
+    modalidades.update({data: "MUTIRÃO" for data in datas_mtr})
+    return modalidades
+
 
+# Campos extraídos de dentro de cada laudo e as funções que os extraem
+CAMPOS_LAUDO = {
+    'data': extrair_data_pdf,
+    'tecnico': extrair_tecnico_pdf,
+    'assentamento': extrair_assentamento_pdf,
+}
 
-def main():
+
+def listar_laudos(pasta_pdf):
+    """Lista, em ordem determinística, os caminhos dos PDFs de laudos."""
+    caminhos = []
+    for root, dirs, files in os.walk(pasta_pdf):
+        dirs.sort()
+        for arquivo in sorted(files):
+            if arquivo.endswith('.pdf') and PADRAO_TIPO_LAUDO.search(arquivo):
+                caminhos.append(os.path.join(root, arquivo))
+    return caminhos
+
+
+def extrair_campos_laudo(documento):
+    """Extrai data, técnico e assentamento de um laudo."""
+    return {
+        nome: documento.campo(f'{PREFIXO_CAMPOS}.{nome}', extrator)
+        for nome, extrator in CAMPOS_LAUDO.items()
+    }
+
+
+def extrair_campos_isolado(caminho_pdf):
+    """Extrai os campos de um laudo sem cache, capturando o erro se houver.
+
+    Executada nos processos do pool; retorna a tupla (campos, erro).
+    """
+    try:
+        return extrair_campos_laudo(DocumentoPDF(caminho_pdf)), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def campos_em_cache(cache, caminho_pdf):
+    """Retorna os campos do laudo se todos já estiverem no cache, senão None."""
+    chave = cache.chave_documento(caminho_pdf)
+    campos = {}
+    for nome in CAMPOS_LAUDO:
+        valor = cache.obter_campo(chave, f'{PREFIXO_CAMPOS}.{nome}')
+        if valor is AUSENTE:
+            return None
+        campos[nome] = valor
+    return campos
+
+
+def extrair_laudos(caminhos, cache, workers=1):
+    """Extrai os campos de todos os laudos, na mesma ordem de `caminhos`.
+
+    Laudos já presentes no cache não são abertos. Os demais são processados
+    no próprio processo (workers=1) ou distribuídos em lotes para um
+    ProcessPoolExecutor; nesse caso apenas os campos (e não os textos de
+    página) são gravados no cache.
+
+    Returns:
+        Lista de tuplas (campos, erro), uma por caminho
+    """
+    resultados = [None] * len(caminhos)
+    pendentes = []
+    for i, caminho in enumerate(caminhos):
+        try:
+            campos = campos_em_cache(cache, caminho)
+        except OSError as e:
+            resultados[i] = (None, f"{type(e).__name__}: {e}")
+            continue
+        if campos is not None:
+            resultados[i] = (campos, None)
+        else:
+            pendentes.append(i)
+
+    print(f"{len(caminhos) - len(pendentes)} laudos lidos do cache, "
+          f"{len(pendentes)} a extrair")
+
+    if workers > 1 and len(pendentes) > 1:
+        caminhos_pendentes = [caminhos[i] for i in pendentes]
+        tamanho_lote = max(1, len(caminhos_pendentes) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            extraidos = executor.map(extrair_campos_isolado, caminhos_pendentes,
+                                     chunksize=tamanho_lote)
+            for i, (campos, erro) in zip(pendentes, extraidos):
+                resultados[i] = (campos, erro)
+                if campos is not None:
+                    chave = cache.chave_documento(caminhos[i])
+                    for nome, valor in campos.items():
+                        cache.salvar_campo(chave, f'{PREFIXO_CAMPOS}.{nome}', valor)
+    else:
+        for i in pendentes:
+            try:
+                documento = DocumentoPDF(caminhos[i], cache)
+                resultados[i] = (extrair_campos_laudo(documento), None)
+            except Exception as e:
+                resultados[i] = (None, f"{type(e).__name__}: {e}")
+
+    return resultados
+
+
+# Colunas do arquivo de estado usado pelo modo incremental
+COLUNAS_ESTADO = ['Caminho', 'Tamanho', 'Mtime'] + list(CAMPOS_LAUDO)
+
+
+def inventariar_laudos(caminhos):
+    """Retorna um DataFrame com caminho, tamanho e data de modificação dos laudos."""
+    inventario = []
+    for caminho in caminhos:
+        stat = os.stat(caminho)
+        inventario.append((caminho, stat.st_size, stat.st_mtime_ns))
+    return pd.DataFrame(inventario, columns=['Caminho', 'Tamanho', 'Mtime'])
+
+
+def carregar_estado(caminho_estado):
+    """Carrega o estado da execução anterior ou um estado vazio."""
+    if os.path.exists(caminho_estado):
+        try:
+            return pd.read_pickle(caminho_estado)
+        except Exception as e:
+            print(f"Estado anterior ilegível ({e}); extraindo tudo novamente.")
+    return pd.DataFrame(columns=COLUNAS_ESTADO)
+
+
+def comparar_inventario(inventario, estado):
+    """Compara o inventário atual com o estado anterior.
+
+    Returns:
+        Tupla (inalterados, novos, modificados, removidos): os três primeiros
+        são listas de caminhos do inventário atual e o último, de caminhos
+        que só existem no estado anterior
+    """
+    anteriores = {
+        caminho: (tamanho, mtime)
+        for caminho, tamanho, mtime in zip(
+            estado['Caminho'], estado['Tamanho'], estado['Mtime'])
+    }
+    inalterados, novos, modificados = [], [], []
+    for caminho, tamanho, mtime in zip(
+            inventario['Caminho'], inventario['Tamanho'], inventario['Mtime']):
+        if caminho not in anteriores:
+            novos.append(caminho)
+        elif anteriores[caminho] != (tamanho, mtime):
+            modificados.append(caminho)
+        else:
+            inalterados.append(caminho)
+    removidos = sorted(set(anteriores) - set(inventario['Caminho']))
+    return inalterados, novos, modificados, removidos
+
+
+def benchmark_classificacao(repeticoes=20000):
+    """Mede o custo por arquivo da classificação com tabelas de datas crescentes.
+
+    Compara a busca linear nas listas de datas (forma anterior) com a
+    consulta ao dicionário de modalidades, cujo custo não cresce com o número
+    de datas, e mede a classificação do tipo de laudo pelo nome do arquivo.
+    """
+    nomes = [f"L{i:03d}_{trecho}_PAASSENTAMENTO.pdf"
+             for i, trecho in enumerate(TIPOS_LAUDO)]
+    tempo_tipo = timeit.timeit(
+        lambda: [verificar_tipo_laudo(nome) for nome in nomes],
+        number=repeticoes // len(nomes)) / repeticoes
+    print(f"Tipo de laudo pelo nome do arquivo: {tempo_tipo * 1e6:.3f} µs/arquivo")
+
+    print(f"{'Datas':>8} {'Lista (µs)':>12} {'Dicionário (µs)':>16}")
+    for tamanho in (100, 1000, 10000):
+        datas = [(date(2022, 1, 1) + timedelta(days=i)).strftime('%d/%m/%Y')
+                 for i in range(tamanho)]
+        datas_mtr, datas_vl = datas[::2], datas[1::2]
+        modalidades = montar_tabela_modalidades(datas_mtr, datas_vl)
+        # Data ausente: pior caso da busca linear
+        consulta = '31/12/2099'
+        tempo_lista = timeit.timeit(
+            lambda: consulta in datas_mtr or consulta in datas_vl,
+            number=repeticoes) / repeticoes
+        tempo_dict = timeit.timeit(
+            lambda: modalidades.get(consulta), number=repeticoes) / repeticoes
+        print(f"{tamanho:>8} {tempo_lista * 1e6:>12.3f} {tempo_dict * 1e6:>16.3f}")
+
+
+def main(argv=None):
     """Função principal."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Número de processos para extrair os PDFs em paralelo '
+             '(padrão: 1, sem paralelismo; 0 usa todos os núcleos)')
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help='Reaproveita o resultado anterior e extrai apenas laudos novos '
+             'ou modificados desde a última execução')
+    parser.add_argument(
+        '--benchmark', action='store_true',
+        help='Apenas mede o custo da classificação de tipo e modalidade')
+    args = parser.parse_args(argv)
+    if args.benchmark:
+        benchmark_classificacao()
+        return
+
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+
     pasta_pdf = 'D:/ufpr.br/Intranet do LAGEAMB - TED-INCRA/02_SO/11_municipiosPAs'
     caminho_csv_datas = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
                          '03_equipeGEOTI/08_automacoes/01_SO/01_datasModalidade.csv')
-    caminho_csv_municipios = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
-                             '03_equipeGEOTI/08_automacoes/01_SO/'
-                             '01_codsipraPAsMunicipios.csv')
     caminho_csv_tecnicos = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
                            '03_equipeGEOTI/08_automacoes/01_SO/01_nomesTecnicos.csv')
+    caminho_arquivo_excel = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
+                             '03_equipeGEOTI/08_automacoes/01_SO/'
+                             '01_laudos_SO_infos.xlsx')
+    caminho_estado = caminho_arquivo_excel.replace('.xlsx', '_estado.pkl')
     resultados = []
+    falhas = []
 
     # Carregar padronização dos nomes dos técnicos
     padronizacao_tecnicos = carregar_padronizacao_tecnicos(caminho_csv_tecnicos)
 
     # Carregar datas de mutirão e vistoria
     datas_mtr, datas_vl = carregar_datas(caminho_csv_datas)
-
-    # Carregar mapeamento de assentamentos para municípios e códigos SIPRA
-    municipios_map, codsipra_map = carregar_municipios(caminho_csv_municipios)
-
-    # Trechos que devem estar no nome do arquivo
-    trechos_validos = [
-        "DecOcupante", "SimpOcupante", "CompOcupante",
-        "DecBeneficiario", "SimpBeneficiario", "CompBeneficiario",
-        "LoteVago"
-    ]
-
-    for root, dirs, files in os.walk(pasta_pdf):
-        for arquivo in files:
-            if arquivo.endswith('.pdf') and any(
-                    trecho in arquivo for trecho in trechos_validos):
-                caminho_completo = os.path.join(root, arquivo)
-                data = extrair_data_pdf(caminho_completo)
-                if data is None:
-                    print(f"Falha ao extrair data do arquivo: {caminho_completo}")
-                    continue
-
-                # Garante que a data extraída está no formato correto e sem espaços extras
-                data = data.strip() if data else None
-
-                tipo_laudo = verificar_tipo_laudo(arquivo)
-                lxx = extrair_lxx(arquivo)
-                tecnico = extrair_tecnico_pdf(caminho_completo)
-                tecnico = padronizar_nome_tecnico(tecnico, padronizacao_tecnicos)
-                assentamento = extrair_assentamento_pdf(caminho_completo)
-
-                # Obter o município e o código SIPRA correspondente ao assentamento
-                municipio = municipios_map.get(assentamento, "Desconhecido")
-                codigo_sipra = codsipra_map.get(assentamento, "Desconhecido")
-
-                modalidade = None
-                if data in datas_mtr:
-                    modalidade = "MUTIRÃO"
-                elif data in datas_vl:
-                    modalidade = "VISTORIA IN LOCO"
-
-                # Para depuração - remova ou comente estas linhas após resolver o problema
-                if assentamento and "Tibagi" in assentamento and not modalidade:
-                    print(f"Data do PDF: '{data}' não encontrada nas datas de vistoria")
-                    print(f"Datas de vistoria disponíveis: {datas_vl[:5]}...")
-
-                resultados.append({
-                    'Código SIPRA': codigo_sipra,
-                    'Município': municipio,
-                    'Assentamento': assentamento,
-                    'Lote': lxx,
-                    'Arquivo': arquivo,
-                    'Data': data,
-                    'Tipo de Laudo': tipo_laudo,
-                    'Técnico': tecnico,
-                    'Modalidade': modalidade
-                })
+    modalidades = montar_tabela_modalidades(datas_mtr, datas_vl)
+
+    # Carregar a tabela de referência de assentamentos, municípios e códigos SIPRA
+    referencia = ReferenciaPAs.carregar()
+
+    # Apenas arquivos com um dos trechos de TIPOS_LAUDO no nome são laudos
+    caminhos = listar_laudos(pasta_pdf)
+    inventario = inventariar_laudos(caminhos)
+
+    # No modo incremental, laudos com mesmo caminho, tamanho e data de
+    # modificação reaproveitam os campos extraídos na execução anterior
+    estado = (carregar_estado(caminho_estado) if args.incremental
+              else pd.DataFrame(columns=COLUNAS_ESTADO))
+    inalterados, novos, modificados, removidos = comparar_inventario(
+        inventario, estado)
+    if args.incremental:
+        print(f"Modo incremental: {len(inalterados)} inalterados, {len(novos)} novos, "
+              f"{len(modificados)} modificados, {len(removidos)} removidos")
+
+    campos_por_caminho = {
+        registro['Caminho']: {nome: registro[nome] for nome in CAMPOS_LAUDO}
+        for registro in estado[estado['Caminho'].isin(inalterados)].to_dict('records')
+    }
+    erros_por_caminho = {}
+
+    # Cache de textos e campos já extraídos em execuções anteriores
+    a_extrair = novos + modificados
+    with CacheExtracao() as cache:
+        extraidos = extrair_laudos(a_extrair, cache, workers)
+        cache.podar(pasta_pdf)
+    for caminho_completo, (campos, erro) in zip(a_extrair, extraidos):
+        if erro is not None:
+            erros_por_caminho[caminho_completo] = erro
+        else:
+            campos_por_caminho[caminho_completo] = campos
+
+    # Salvar o estado para a próxima execução incremental
+    estado = inventario[inventario['Caminho'].isin(campos_por_caminho.keys())].copy()
+    for nome in CAMPOS_LAUDO:
+        estado[nome] = [campos_por_caminho[c][nome] for c in estado['Caminho']]
+    estado.to_pickle(caminho_estado)
+
+    for caminho_completo in caminhos:
+        if caminho_completo in erros_por_caminho:
+            falhas.append((caminho_completo, erros_por_caminho[caminho_completo]))
+            continue
+
+        campos = campos_por_caminho[caminho_completo]
+
+        data = campos['data']
+        if pd.isna(data):
+            falhas.append((caminho_completo, "data não encontrada"))
+            continue
+
+        # Garante que a data extraída está no formato correto e sem espaços extras
+        data = data.strip() if data else None
+
+        arquivo = os.path.basename(caminho_completo)
+        tipo_laudo = verificar_tipo_laudo(arquivo)
+        lxx = extrair_lxx(arquivo)
+        tecnico = padronizar_nome_tecnico(campos['tecnico'], padronizacao_tecnicos)
+        assentamento = campos['assentamento']
+
+        # Obter o município e o código SIPRA correspondente ao assentamento
+        municipio = referencia.municipio(assentamento)
+        codigo_sipra = referencia.codsipra(assentamento)
+
+        modalidade = modalidades.get(data)
+
+        # Para depuração - remova ou comente estas linhas após resolver o problema
+        if assentamento and "Tibagi" in assentamento and not modalidade:
+            print(f"Data do PDF: '{data}' não encontrada nas datas de vistoria")
+            print(f"Datas de vistoria disponíveis: {datas_vl[:5]}...")
+
+        resultados.append({
+            'Código SIPRA': codigo_sipra,
+            'Município': municipio,
+            'Assentamento': assentamento,
+            'Lote': lxx,
+            'Arquivo': arquivo,
+            'Data': data,
+            'Tipo de Laudo': tipo_laudo,
+            'Técnico': tecnico,
+            'Modalidade': modalidade
+        })
+
+    if falhas:
+        print(f"Falha ao extrair {len(falhas)} arquivo(s):")
+        for caminho_completo, erro in falhas:
+            print(f"  {caminho_completo}: {erro}")
 
     df = pd.DataFrame(resultados)
 
     if not df.empty:
-        caminho_arquivo_excel = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
-                                '03_equipeGEOTI/08_automacoes/01_SO/'
-                                '01_laudos_SO_infos.xlsx')
-
         # Exclua o arquivo existente, se houver
         if os.path.exists(caminho_arquivo_excel):
             os.remove(caminho_arquivo_excel)
@@ -232,6 +477,8 @@ def main():
         ]]
 
         df.to_excel(caminho_arquivo_excel, index=False)
+        publicar_parquet(caminho_arquivo_excel, dimensoes_cubo=DIMENSOES_CUBO,
+                         colunas_mensais=COLUNAS_MENSAIS_CUBO)
 
         print("Dados extraídos e salvos em", caminho_arquivo_excel)
     else:
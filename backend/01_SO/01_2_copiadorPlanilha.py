@@ -8,11 +8,28 @@ caminho_repositorio = 'C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so
 # Copiar e substituir o arquivo do SharePoint para o repositório
 shutil.copyfile(caminho_sharepoint, caminho_repositorio)
 
+# Copiar também a versão em Parquet, lida mais rapidamente pelo dashboard;
+# se ela não foi gerada, remover a cópia antiga para não exibir dados velhos
+parquet_sharepoint = caminho_sharepoint.replace('.xlsx', '.parquet')
+parquet_repositorio = caminho_repositorio.replace('.xlsx', '.parquet')
+if os.path.exists(parquet_sharepoint):
+    shutil.copyfile(parquet_sharepoint, parquet_repositorio)
+elif os.path.exists(parquet_repositorio):
+    os.remove(parquet_repositorio)
+
+# O mesmo para o cubo de contagens usado nos gráficos
+cubo_sharepoint = caminho_sharepoint.replace('.xlsx', '_cubo.parquet')
+cubo_repositorio = caminho_repositorio.replace('.xlsx', '_cubo.parquet')
+if os.path.exists(cubo_sharepoint):
+    shutil.copyfile(cubo_sharepoint, cubo_repositorio)
+elif os.path.exists(cubo_repositorio):
+    os.remove(cubo_repositorio)
+
 # Caminho para o executável do Git
 git_executable = '"C:/Program Files/Git/cmd/git.exe"'
 
 # Navegar até o diretório do repositório e executar comandos Git
 os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} pull --no-edit')
-os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} add 01_laudos_SO_infos.xlsx')
+os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} add "01_laudos_SO_infos*"')
 os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} commit -m "Atualização do arquivo de laudos"')
 os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} push')
@@ -6,35 +6,141 @@ Script para processamento de documentos PDF relacionados a assentamentos.
 Combina funcionalidades de renomeação de arquivos.
 """
 
+import argparse
 import os
-import pandas as pd
-import PyPDF2
 import re
 import shutil
+import sys
 import unidecode
 from thefuzz import process
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import datetime
 
-
-def extract_text_from_pdf(pdf_path):
-    """Extrai o texto de um arquivo PDF."""
-    print(f"Tentando abrir o arquivo: {pdf_path}")
-    try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ''
-            for page in reader.pages:
-                text += page.extract_text() or ''
-        return text
-    except Exception as e:
-        print(f"Erro ao processar o arquivo {pdf_path}: {e}")
-        return ""
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from correspondencia import CorrespondenteFuzzy  # noqa: E402
+from extracao_pdf import CacheExtracao, DocumentoPDF  # noqa: E402
+from referencia_pas import CAMINHO_REFERENCIA_PADRAO, ReferenciaPAs  # noqa: E402
+
+
+# Número máximo de páginas lidas por documento (None = todas). Sem limite,
+# a leitura só para quando os campos da renomeação já foram encontrados, e
+# os nomes gerados são os mesmos da leitura do texto completo.
+PAGE_BUDGET = None
+
+# Padrões procurados no texto dos documentos
+DATE_PATTERN = re.compile(r'em (\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2})')
+ANALISE_SETTLEMENT_PATTERN = re.compile(
+    r'Projeto de Assentamento:\s*(PA [A-Z\s]+)(?= Processo Administrativo \(SEI\))')
+ANALISE_ASSENTED_PATTERN = re.compile(r'Nome Completo:\s*([A-Za-z]+)')
+CONFORMIDADES_REGULARIZACAO_PATTERN = re.compile(
+    r'Solicitação de Regularização de Ocupantes em Assentamentos')
+CONFORMIDADES_SETTLEMENT_PATTERN = re.compile(
+    r'Projeto Assentamento:\s*[^-]+-\s*(PA [A-Z\s]+)(?= Processo administrativo \(SEI\))')
+CONFORMIDADES_ASSENTED_PATTERN = re.compile(r'Nome:\s*([A-Za-z]+)')
+SOLICITACAO_SETTLEMENT_PATTERNS = [
+    re.compile(r'PA\s*([A-Z\s]+?)(?=,|$)'),
+    re.compile(r'Projeto de Assentamento\s*([A-Z\s]+)'),
+]
+SOLICITACAO_ASSENTED_PATTERNS = [
+    re.compile(r'Sr(?:\(a\))?\.\s*([A-Za-z]+)'),
+    re.compile(r',\s*([A-Za-z]+)\s+[A-Za-z]+\s+[A-Za-z]+'),
+]
+PA_NAME_PATTERNS = [
+    re.compile(r'PA\s+([^\.,:;\n]+)', re.IGNORECASE),
+    re.compile(r'Projeto de Assentamento\s+([^\.,:;\n]+)', re.IGNORECASE),
+    re.compile(r'P\.A\.\s+([^\.,:;\n]+)', re.IGNORECASE),
+]
+# Primeiro padrão de PA_NAME_PATTERNS com um nome não vazio
+PA_NAME_REQUIRED_PATTERN = re.compile(r'PA\s+[^\.,:;\n]*[^\s\.,:;\n]', re.IGNORECASE)
+
+
+# Padrões que precisam ser encontrados para cada uso do texto; a leitura
+# das páginas para assim que todos aparecem. Onde a renomeação tenta
+# padrões alternativos em ordem, só o preferido é exigido: sem ele, o
+# documento é lido inteiro e o alternativo é procurado no texto completo.
+REQUIRED_PATTERNS = {
+    'analise': [ANALISE_SETTLEMENT_PATTERN, ANALISE_ASSENTED_PATTERN],
+    'conformidades': [CONFORMIDADES_REGULARIZACAO_PATTERN, CONFORMIDADES_SETTLEMENT_PATTERN,
+                      CONFORMIDADES_ASSENTED_PATTERN, DATE_PATTERN],
+    'solicitacao': [SOLICITACAO_SETTLEMENT_PATTERNS[0], SOLICITACAO_ASSENTED_PATTERNS[0]],
+    'data': [DATE_PATTERN],
+    'pa': [PA_NAME_REQUIRED_PATTERN],
+}
+
+
+class PDFInventory:
+    """Inventário dos PDFs da árvore, montado em uma única varredura.
+
+    Guarda, por pasta, os nomes dos PDFs e o texto dos arquivos já lidos, de
+    forma que a renomeação e a análise de UnknownSettlement usam a mesma
+    listagem e nenhum PDF é lido duas vezes na mesma execução.
+    """
+
+    def __init__(self, directory_path, cache=None, max_pages=PAGE_BUDGET):
+        """Percorre `directory_path` com os.scandir e lista os PDFs.
+
+        Args:
+            directory_path: Pasta raiz dos documentos
+            cache: CacheExtracao opcional com textos de execuções anteriores
+            max_pages: Número máximo de páginas lidas por PDF (None = todas)
+        """
+        self.cache = cache
+        self.max_pages = max_pages
+        self.folders = {}
+        self._documents = {}
+        self._scan(directory_path)
+
+    def _scan(self, path):
+        """Lista os PDFs de `path` e desce nas subpastas (ordem do os.walk)."""
+        pdfs, subfolders = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subfolders.append(entry.path)
+                    elif entry.name.endswith('.pdf'):
+                        pdfs.append(entry.name)
+        except OSError as e:
+            print(f"Erro ao listar a pasta {path}: {e}")
+            return
+        self.folders[path] = pdfs
+        for subfolder in subfolders:
+            self._scan(subfolder)
+
+    def text(self, pdf_path, purpose):
+        """Texto das páginas do PDF necessárias para `purpose`.
+
+        `purpose` é uma chave de REQUIRED_PATTERNS. Cada página é extraída
+        no máximo uma vez por execução, mesmo entre usos diferentes.
+        """
+        document = self._documents.get(pdf_path)
+        if document is None:
+            print(f"Tentando abrir o arquivo: {pdf_path}")
+            document = self._documents[pdf_path] = DocumentoPDF(pdf_path, self.cache)
+        try:
+            return document.texto_parcial(REQUIRED_PATTERNS[purpose], self.max_pages)
+        except Exception as e:
+            print(f"Erro ao processar o arquivo {pdf_path}: {e}")
+            return ""
+        finally:
+            document.liberar_arquivo()
+
+    def record_rename(self, root, old_name, new_name):
+        """Atualiza o inventário (e o cache) após renomear um arquivo da pasta `root`."""
+        files = self.folders[root]
+        files[files.index(old_name)] = new_name
+        if self.cache is not None:
+            self.cache.registrar_renomeacao(
+                os.path.join(root, old_name), os.path.join(root, new_name))
+        document = self._documents.pop(os.path.join(root, old_name), None)
+        if document is not None:
+            document.caminho_pdf = os.path.join(root, new_name)
+            self._documents[document.caminho_pdf] = document
 
 
 def extract_date_from_text(pdf_text):
     """Extrai a data de um texto de PDF."""
-    date_match = re.search(r'em (\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2})', pdf_text)
+    date_match = DATE_PATTERN.search(pdf_text)
     if date_match:
         date_str = date_match.group(1)
         try:
@@ -66,12 +172,12 @@ def extract_info_from_filename(filename):
 
 
 def load_mapping(csv_file):
-    """Carrega o arquivo de mapeamento CSV."""
+    """Carrega a tabela de referência de assentamentos (com a coluna nomePA)."""
     try:
-        df_mapping = pd.read_csv(csv_file, delimiter=',')
+        referencia = ReferenciaPAs.carregar(csv_file)
         print(f"Arquivo de mapeamento carregado com sucesso. "
-              f"Total de registros: {len(df_mapping)}")
-        return df_mapping
+              f"Total de registros: {len(referencia.registros)}")
+        return referencia
     except Exception as e:
         print(f"Erro ao carregar arquivo de mapeamento: {e}")
         raise
@@ -92,33 +198,49 @@ def find_best_match(name, choices):
     return match if score > 80 else 'Desconhecido'
 
 
-def find_best_match_in_csv(pa_name, df_mapping):
-    """Encontra a melhor correspondência para um nome de PA no DataFrame de mapeamento."""
-    if not pa_name:
-        return None, None
+# Índice dos assentamentos pelo nome normalizado, montado uma única vez
+PALookup = namedtuple('PALookup', ['registros', 'correspondente'])
+
 
-    normalized_pa = normalize_text(pa_name)
-    choices = df_mapping['Assentamento'].tolist()
-    normalized_choices = [normalize_text(choice) for choice in choices]
+def build_pa_lookup(referencia):
+    """Monta o índice nome normalizado → registro da tabela de referência.
 
-    match = process.extractOne(normalized_pa, normalized_choices)
-    if match and match[1] > 80:
-        index = normalized_choices.index(match[0])
-        return df_mapping.iloc[index]['Assentamento'], df_mapping.iloc[index]['nomePA']
-    return None, None
+    Os nomes são normalizados uma única vez; se dois assentamentos tiverem o
+    mesmo nome normalizado, vale o primeiro da tabela.
+    """
+    registros = {}
+    for registro in referencia.registros:
+        registros.setdefault(normalize_text(registro['Assentamento']), registro)
+    return PALookup(registros, CorrespondenteFuzzy(list(registros)))
+
+
+def find_best_matches_in_csv(pa_names, pa_lookup):
+    """Encontra de uma vez as correspondências de vários nomes de PA.
+
+    Returns:
+        Lista de tuplas (Assentamento, nomePA), ou (None, None) para nomes
+        sem correspondência adequada, na mesma ordem de `pa_names`
+    """
+    normalized_names = [normalize_text(pa_name) for pa_name in pa_names]
+    results = []
+    for match, score in pa_lookup.correspondente.melhores(normalized_names):
+        if match and score > 80:
+            registro = pa_lookup.registros[match]
+            results.append((registro['Assentamento'], registro['nomePA']))
+        else:
+            results.append((None, None))
+    return results
+
+
+def find_best_match_in_csv(pa_name, pa_lookup):
+    """Encontra a melhor correspondência para um nome de PA na tabela de referência."""
+    return find_best_matches_in_csv([pa_name], pa_lookup)[0]
 
 
 def find_pa_name_in_text(text):
     """Encontra o nome do PA no texto do PDF."""
-    patterns = [
-        r'PA\s+([^\.,:;\n]+)',
-        r'Projeto de Assentamento\s+([^\.,:;\n]+)',
-        r'P\.A\.\s+([^\.,:;\n]+)'
-    ]
-
-    for pattern in patterns:
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        for match in matches:
+    for pattern in PA_NAME_PATTERNS:
+        for match in pattern.finditer(text):
             pa_name = match.group(1).strip()
             if pa_name:
                 return pa_name
@@ -163,17 +285,23 @@ def is_relatorio_conformidades(filename):
     return filename.startswith(("RELATORIO_CONFORMIDADES_", "relatorioConformidades"))
 
 
+def document_purpose(filename):
+    """Chave de REQUIRED_PATTERNS com os campos usados para renomear o arquivo."""
+    if filename.startswith(("ANALISE_RO_", "analiseRegularizacao_")):
+        return 'analise'
+    if is_relatorio_conformidades(filename):
+        return 'conformidades'
+    return 'solicitacao'
+
+
 def rename_analise_regularizacao(original_name, pdf_text):
     """Renomeia arquivos de análise de regularização."""
     reduced_name = re.sub(r'ANALISE_RO_', 'analiseRegularizacao_', 
                           original_name, flags=re.IGNORECASE)
-    settlement_match = re.search(
-        r'Projeto de Assentamento:\s*(PA [A-Z\s]+)(?= Processo Administrativo \(SEI\))', 
-        pdf_text
-    )
+    settlement_match = ANALISE_SETTLEMENT_PATTERN.search(pdf_text)
     settlement_name = settlement_match.group(1).replace(' ', '').replace('\n', '') \
         if settlement_match else "UnknownSettlement"
-    assented_match = re.search(r'Nome Completo:\s*([A-Za-z]+)', pdf_text)
+    assented_match = ANALISE_ASSENTED_PATTERN.search(pdf_text)
     assented_name = assented_match.group(1) if assented_match else "UnknownAssented"
     new_name = f"{reduced_name.split('_')[0]}_{settlement_name}_{assented_name}_" \
                f"{reduced_name.split('_')[-1]}"
@@ -191,13 +319,10 @@ def rename_relatorio_conformidades(original_name, pdf_text):
 
     reduced_name = re.sub(r'RELATORIO_CONFORMIDADES_', prefix, 
                           original_name, flags=re.IGNORECASE)
-    settlement_match = re.search(
-        r'Projeto Assentamento:\s*[^-]+-\s*(PA [A-Z\s]+)(?= Processo administrativo \(SEI\))', 
-        pdf_text
-    )
+    settlement_match = CONFORMIDADES_SETTLEMENT_PATTERN.search(pdf_text)
     settlement_name = settlement_match.group(1).replace(' ', '').replace('\n', '').strip() \
         if settlement_match else "UnknownSettlement"
-    assented_match = re.search(r'Nome:\s*([A-Za-z]+)', pdf_text)
+    assented_match = CONFORMIDADES_ASSENTED_PATTERN.search(pdf_text)
     assented_name = assented_match.group(1) if assented_match else "UnknownAssented"
     new_name = f"{reduced_name.split('_')[0]}_{settlement_name}_{assented_name}_" \
                f"{reduced_name.split('_')[-1]}"
@@ -209,14 +334,14 @@ def rename_solicitacao_documentacao(original_name, pdf_text):
     reduced_name = re.sub(r'SOLICITACAO_DOCUMENTACAO_COMPLEMENTAR_', 
                           'solicitacaoDocComplementar_', 
                           original_name, flags=re.IGNORECASE)
-    settlement_match = re.search(r'PA\s*([A-Z\s]+?)(?=,|$)', pdf_text)
+    settlement_match = SOLICITACAO_SETTLEMENT_PATTERNS[0].search(pdf_text)
     if not settlement_match:
-        settlement_match = re.search(r'Projeto de Assentamento\s*([A-Z\s]+)', pdf_text)
+        settlement_match = SOLICITACAO_SETTLEMENT_PATTERNS[1].search(pdf_text)
     settlement_name = settlement_match.group(1).replace(' ', '').replace('\n', '') \
         if settlement_match else "UnknownSettlement"
-    assented_match = re.search(r'Sr(?:\(a\))?\.\s*([A-Za-z]+)', pdf_text)
+    assented_match = SOLICITACAO_ASSENTED_PATTERNS[0].search(pdf_text)
     if not assented_match:
-        assented_match = re.search(r',\s*([A-Za-z]+)\s+[A-Za-z]+\s+[A-Za-z]+', pdf_text)
+        assented_match = SOLICITACAO_ASSENTED_PATTERNS[1].search(pdf_text)
     assented_name = assented_match.group(1).replace('\n', '') \
         if assented_match else "UnknownAssented"
     new_name = f"{reduced_name.split('_')[0]}_{settlement_name}_{assented_name}_" \
@@ -224,50 +349,59 @@ def rename_solicitacao_documentacao(original_name, pdf_text):
     return new_name
 
 
-def rename_unknown_settlement_files(directory_path, df_mapping):
+def rename_unknown_settlement_files(inventory, pa_lookup):
     """Renomeia arquivos com UnknownSettlement usando o mapeamento."""
     print("\nIniciando análise de arquivos com UnknownSettlement...")
 
-    for root, _, files in os.walk(directory_path):
+    # Primeiro coleta os nomes de PA de todos os arquivos pendentes
+    pending = []
+    for root, files in inventory.folders.items():
         for filename in files:
-            if 'UnknownSettlement' in filename and filename.endswith('.pdf'):
+            if 'UnknownSettlement' in filename:
                 full_path = os.path.join(root, filename)
                 print(f"\nAnalisando arquivo: {filename}")
 
-                pdf_text = extract_text_from_pdf(full_path)
+                pdf_text = inventory.text(full_path, 'pa')
                 pa_name = find_pa_name_in_text(pdf_text)
 
                 if pa_name:
                     print(f"Nome do PA encontrado no PDF: {pa_name}")
-
-                    assentamento, nome_pa = find_best_match_in_csv(pa_name, df_mapping)
-
-                    if assentamento and nome_pa:
-                        new_filename = filename.replace('UnknownSettlement', nome_pa)
-                        new_full_path = os.path.join(root, new_filename)
-
-                        try:
-                            shutil.move(full_path, new_full_path)
-                            print(f"Arquivo renomeado com sucesso para: {new_filename}")
-                        except Exception as e:
-                            print(f"Erro ao renomear arquivo: {e}")
-                    else:
-                        print(f"Não foi encontrada correspondência adequada no CSV para: {pa_name}")
+                    pending.append((root, filename, pa_name))
                 else:
                     print(f"Não foi possível encontrar o nome do PA no arquivo PDF")
 
-
-def process_pdfs_in_directory(directory_path, df_mapping):
+    # Depois resolve todos os nomes em uma única chamada e renomeia
+    matches = find_best_matches_in_csv([pa_name for _, _, pa_name in pending], pa_lookup)
+    for (root, filename, pa_name), (assentamento, nome_pa) in zip(pending, matches):
+        if assentamento and nome_pa:
+            new_filename = filename.replace('UnknownSettlement', nome_pa)
+            new_full_path = os.path.join(root, new_filename)
+
+            try:
+                shutil.move(os.path.join(root, filename), new_full_path)
+                inventory.record_rename(root, filename, new_filename)
+                print(f"Arquivo renomeado com sucesso para: {new_filename}")
+            except Exception as e:
+                print(f"Erro ao renomear arquivo: {e}")
+        else:
+            print(f"Não foi encontrada correspondência adequada no CSV para: {pa_name}")
+
+
+def process_pdfs_in_directory(directory_path, pa_lookup, cache=None,
+                              max_pages=PAGE_BUDGET):
     """Processa os PDFs no diretório para renomeação."""
     output = []
     report_files = defaultdict(list)
     renamed_files = {}
 
+    # Uma única varredura da árvore, compartilhada pelos dois passos
+    inventory = PDFInventory(directory_path, cache, max_pages)
+
     # Primeiro passo: coletar informações e renomear arquivos que precisam ser renomeados
-    for root, _, files in os.walk(directory_path):
+    for root, files in inventory.folders.items():
         conformidades_files = []
 
-        for filename in files:
+        for filename in list(files):
             if not should_process_file(filename):
                 continue
 
@@ -279,14 +413,14 @@ def process_pdfs_in_directory(directory_path, df_mapping):
 
                 # Ainda precisamos processar relatórios de conformidade para possível prefixo
                 if is_relatorio_conformidades(filename):
-                    pdf_text = extract_text_from_pdf(pdf_path)
+                    pdf_text = inventory.text(pdf_path, 'data')
                     report_date = extract_date_from_text(pdf_text)
                     if report_date:
                         conformidades_files.append((pdf_path, filename, report_date))
                 continue
 
             print(f"Processando arquivo: {pdf_path}")
-            pdf_text = extract_text_from_pdf(pdf_path)
+            pdf_text = inventory.text(pdf_path, document_purpose(filename))
 
             if is_relatorio_conformidades(filename):
                 report_date = extract_date_from_text(pdf_text)
@@ -307,6 +441,7 @@ def process_pdfs_in_directory(directory_path, df_mapping):
                 new_file_path = os.path.join(root, new_file_name)
                 try:
                     os.rename(pdf_path, new_file_path)
+                    inventory.record_rename(root, filename, new_file_name)
                     renamed_files[pdf_path] = new_file_path
                     output.append(f"Renomeado: '{filename}' para '{new_file_name}'")
                 except Exception as e:
@@ -325,22 +460,32 @@ def process_pdfs_in_directory(directory_path, df_mapping):
                 new_file_path = os.path.join(root, new_name_with_prefix)
                 try:
                     os.rename(current_path, new_file_path)
+                    inventory.record_rename(root, current_name, new_name_with_prefix)
                     output.append(f"Adicionado prefixo: '{current_name}' para '{new_name_with_prefix}'")
                 except Exception as e:
                     print(f"Erro ao adicionar prefixo ao arquivo {current_path}: {e}")
 
     # Após processar todos os arquivos, chama a função para renomear arquivos com UnknownSettlement
-    rename_unknown_settlement_files(directory_path, df_mapping)
+    rename_unknown_settlement_files(inventory, pa_lookup)
 
     return output
 
 
-def main():
+def main(argv=None):
     """Função principal que executa o fluxo completo do programa."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--max-paginas', type=int, default=0,
+        help='Número máximo de páginas lidas por PDF ao procurar os campos '
+             'da renomeação (padrão: 0, lê até encontrar os campos); um '
+             'limite pode deixar campos de páginas posteriores sem ser lidos')
+    args = parser.parse_args(argv)
+    max_pages = args.max_paginas or None
+
     # Caminhos dos arquivos
     directory_path = 'D:/ufpr.br/Intranet do LAGEAMB - TED-INCRA/02_SO/11_municipiosPAs'
     output_path = 'D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes/02_SO/02_contPGT.xlsx'
-    csv_mapping_file = 'D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes/02_SO/02_codsipraPAsMunicipiosNomePAs.csv'
+    csv_mapping_file = CAMINHO_REFERENCIA_PADRAO
 
     print("\n=== Iniciando processamento ===")
     print(f"Diretório de entrada: {directory_path}")
@@ -348,10 +493,15 @@ def main():
 
     try:
         # Carrega o arquivo de mapeamento
-        df_mapping = load_mapping(csv_mapping_file)
-
-        # Primeiro renomeia os arquivos conforme necessário
-        rename_results = process_pdfs_in_directory(directory_path, df_mapping)
+        referencia = load_mapping(csv_mapping_file)
+        pa_lookup = build_pa_lookup(referencia)
+
+        # Primeiro renomeia os arquivos conforme necessário, reaproveitando
+        # os textos de PDFs já extraídos em execuções anteriores
+        with CacheExtracao() as cache:
+            rename_results = process_pdfs_in_directory(
+                directory_path, pa_lookup, cache, max_pages)
+            cache.podar(directory_path)
         for line in rename_results:
             print(line)
 
@@ -2,9 +2,19 @@
 
 import os
 import re
+import sys
 import time
 import pandas as pd
-from thefuzz import process
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from publicacao import publicar_parquet  # noqa: E402
+from referencia_pas import CAMINHO_REFERENCIA_PADRAO, ReferenciaPAs  # noqa: E402
+
+# Colunas do cubo de contagens usado pelos gráficos do dashboard; Nome T1
+# fica de fora por ter quase um valor por documento
+DIMENSOES_CUBO = [
+    'Tipo de documento PGT', 'Assentamento', 'Município', 'Objetivo'
+]
 
 
 class LocalizationData:
@@ -12,9 +22,7 @@ class LocalizationData:
 
     def __init__(self):
         """Inicializa a classe com caminhos de arquivos e dicionários de exceções."""
-        self.csv_mapping_file = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
-                                '03_equipeGEOTI/08_automacoes/02_SO/'
-                                '02_codsipraPAsMunicipios.csv')
+        self.csv_mapping_file = CAMINHO_REFERENCIA_PADRAO
 
         # Dicionários de exceções
         self.municipio_exceptions = {
@@ -69,44 +77,34 @@ def extract_info_from_filename(filename):
 
 
 def load_mapping(csv_file):
-    """Carrega o arquivo de mapeamento e cria dicionários.
+    """Carrega a tabela de referência de assentamentos.
 
     Args:
         csv_file: Caminho para o arquivo CSV de mapeamento
 
     Returns:
-        Tupla com dataframe de mapeamento e dicionários de mapeamento
+        Instância de ReferenciaPAs com os índices por assentamento
 
     Raises:
         Exception: Se ocorrer erro ao carregar o arquivo
     """
     try:
-        df_mapping = pd.read_csv(csv_file, delimiter=',')
+        referencia = ReferenciaPAs.carregar(csv_file)
         print(f"Arquivo de mapeamento carregado com sucesso. "
-              f"Total de registros: {len(df_mapping)}")
-
-        # Criar dicionários de mapeamento
-        assentamento_to_municipio = dict(zip(
-            df_mapping['Assentamento'].str.upper(),
-            df_mapping['Município'].str.upper()
-        ))
-        assentamento_to_codsipra = dict(zip(
-            df_mapping['Assentamento'].str.upper(),
-            df_mapping['Codsipra']
-        ))
-
-        return df_mapping, assentamento_to_municipio, assentamento_to_codsipra
+              f"Total de registros: {len(referencia.registros)}")
+        return referencia
     except Exception as e:
         print(f"Erro ao carregar arquivo de mapeamento: {e}")
         raise
 
 
-def find_best_match(name, choices, threshold=80):
-    """Encontra a melhor correspondência usando fuzzy matching.
+def find_best_match(name, referencia, threshold=80):
+    """Encontra o assentamento mais parecido usando fuzzy matching.
 
     Args:
         name: Nome a ser procurado
-        choices: Lista de opções para comparação
+        referencia: Tabela de referência (ReferenciaPAs), cujo correspondente
+            memoriza os nomes já consultados
         threshold: Limite mínimo de pontuação para considerar uma correspondência
 
     Returns:
@@ -114,7 +112,7 @@ def find_best_match(name, choices, threshold=80):
     """
     if not name:
         return 'Desconhecido'
-    match, score, _ = process.extractOne(name, choices)
+    match, score = referencia.melhor_correspondencia(name)
     return match if score > threshold else 'Desconhecido'
 
 
@@ -214,17 +212,13 @@ def extract_assentamento_from_path(file_path, assentamento_exceptions):
     return processed_name.upper()
 
 
-def process_pdfs_in_directory(directory_path, output_path, df_mapping, 
-                             assentamento_to_municipio, assentamento_to_codsipra, 
-                             loc_data):
+def process_pdfs_in_directory(directory_path, output_path, referencia, loc_data):
     """Processa arquivos PDF em um diretório e gera uma planilha com os dados.
 
     Args:
         directory_path: Caminho do diretório com os arquivos PDF
         output_path: Caminho para salvar a planilha de saída
-        df_mapping: DataFrame com mapeamento de assentamentos
-        assentamento_to_municipio: Dicionário de mapeamento assentamento->município
-        assentamento_to_codsipra: Dicionário de mapeamento assentamento->código SIPRA
+        referencia: ReferenciaPAs com a tabela de assentamentos
         loc_data: Instância da classe LocalizationData com dados de exceções
     """
     tipo_documento_map = {
@@ -282,20 +276,11 @@ def process_pdfs_in_directory(directory_path, output_path, df_mapping,
                         objetivo = 'Titulação'
 
                     # Encontra a melhor correspondência para o assentamento
-                    best_assentamento = find_best_match(
-                        assentamento, 
-                        df_mapping['Assentamento']
-                    )
+                    best_assentamento = find_best_match(assentamento, referencia)
 
-                    # Obtém o município e código SIPRA do dicionário de mapeamento
-                    municipio = assentamento_to_municipio.get(
-                        best_assentamento.upper(), 
-                        'Desconhecido'
-                    )
-                    codsipra = assentamento_to_codsipra.get(
-                        best_assentamento.upper(), 
-                        'Desconhecido'
-                    )
+                    # Obtém o município e código SIPRA da tabela de referência
+                    municipio = referencia.municipio(best_assentamento)
+                    codsipra = referencia.codsipra(best_assentamento)
 
                     data.append({
                         'Tipo de documento PGT': tipo_documento_full,
@@ -356,6 +341,8 @@ def process_pdfs_in_directory(directory_path, output_path, df_mapping,
         # Verifica se o arquivo foi realmente criado
         if os.path.exists(output_path):
             print(f'Verificação: arquivo existe no caminho especificado')
+            publicar_parquet(output_path, dimensoes_cubo=[
+                coluna for coluna in DIMENSOES_CUBO if coluna in df.columns])
         else:
             print(f"Aviso: Arquivo não encontrado após salvamento")
 
@@ -377,9 +364,7 @@ def main():
                      '02_SO/11_municipiosPAs')
     output_path = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
                   '03_equipeGEOTI/08_automacoes/02_SO/02_contPGT.xlsx')
-    csv_mapping_file = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
-                       '03_equipeGEOTI/08_automacoes/02_SO/'
-                       '02_codsipraPAsMunicipios.csv')
+    csv_mapping_file = CAMINHO_REFERENCIA_PADRAO
 
     print("\n=== Iniciando processamento ===")
     print(f"Diretório de entrada: {directory_path}")
@@ -390,18 +375,14 @@ def main():
         # Inicializa a classe de dados de localização
         loc_data = LocalizationData()
 
-        # Carrega o mapeamento e cria os dicionários
-        df_mapping, assentamento_to_municipio, assentamento_to_codsipra = load_mapping(
-            csv_mapping_file
-        )
+        # Carrega a tabela de referência de assentamentos
+        referencia = load_mapping(csv_mapping_file)
 
         # Processa os arquivos PDF
         process_pdfs_in_directory(
             directory_path, 
             output_path, 
-            df_mapping, 
-            assentamento_to_municipio, 
-            assentamento_to_codsipra, 
+            referencia, 
             loc_data
         )
     except Exception as e:
@@ -2,8 +2,12 @@
 
 import os
 import re
+import sys
 import pandas as pd
-from thefuzz import process
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from publicacao import publicar_parquet  # noqa: E402
+from referencia_pas import CAMINHO_REFERENCIA_PADRAO, ReferenciaPAs  # noqa: E402
 
 
 class LocalizationData:
@@ -15,9 +19,7 @@ class LocalizationData:
                                '02_SO/11_municipiosPAs')
         self.output_directory = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
                                  '03_equipeGEOTI/08_automacoes/03_SO')
-        self.csv_mapping_file = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
-                                 '03_equipeGEOTI/08_automacoes/03_SO/'
-                                 '03_codsipraPAsMunicipios.csv')
+        self.csv_mapping_file = CAMINHO_REFERENCIA_PADRAO
 
         # Dicionários de exceções carregados do CSV
         self.municipio_exceptions = {}
@@ -64,22 +66,12 @@ class DataProcessor:
     def __init__(self, localization_data):
         """Inicializa o processador com dados de localização."""
         self.loc_data = localization_data
-        self.df_mapping = None
-        self.assentamento_to_municipio = {}
-        self.assentamento_to_codsipra = {}
+        self.referencia = None
 
     def load_mapping(self):
-        """Carrega mapeamentos do arquivo CSV."""
+        """Carrega a tabela de referência de assentamentos."""
         try:
-            self.df_mapping = pd.read_csv(self.loc_data.csv_mapping_file)
-            self.assentamento_to_municipio = dict(zip(
-                self.df_mapping['Assentamento'].str.upper(),
-                self.df_mapping['Município'].str.upper()
-            ))
-            self.assentamento_to_codsipra = dict(zip(
-                self.df_mapping['Assentamento'].str.upper(),
-                self.df_mapping['Codsipra']
-            ))
+            self.referencia = ReferenciaPAs.carregar(self.loc_data.csv_mapping_file)
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"Arquivo de mapeamento não encontrado: "
@@ -175,12 +167,15 @@ class DataProcessor:
 
         return processed_name
 
-    @staticmethod
-    def find_best_match(name, choices):
-        """Encontra a melhor correspondência usando fuzzy matching."""
+    def find_best_match(self, name, campo):
+        """Encontra a melhor correspondência usando fuzzy matching.
+
+        `campo` é a coluna da referência ('Município' ou 'Assentamento');
+        nomes repetidos são resolvidos pelo cache do correspondente.
+        """
         if not name:
             return 'Desconhecido'
-        match, score, _ = process.extractOne(name, choices)
+        match, score = self.referencia.melhor_correspondencia(name, campo)
         return match if score > 80 else 'Desconhecido'
 
     @staticmethod
@@ -195,28 +190,31 @@ class DataProcessor:
     def process_files(self):
         """Processa os arquivos e gera o DataFrame final."""
         pdf_files = self.find_pdfs_with_prefix()
+        infos = [self.extract_info(pdf_file) for pdf_file in pdf_files]
         data = []
 
-        for pdf_file in pdf_files:
-            municipio, assentamento = self.extract_info(pdf_file)
+        # Pontua de uma vez todos os nomes distintos; o laço abaixo só
+        # consulta o cache dos correspondentes
+        self.referencia.correspondencias([m for m, _ in infos], 'Município')
+        self.referencia.correspondencias([a for _, a in infos], 'Assentamento')
+
+        for pdf_file, (municipio, assentamento) in zip(pdf_files, infos):
 
             best_municipio = (
                 municipio if municipio in self.loc_data.municipio_exceptions.values()
-                else self.find_best_match(municipio, self.df_mapping['Município'])
+                else self.find_best_match(municipio, 'Município')
             )
 
             best_assentamento = (
                 assentamento if assentamento in self.loc_data.assentamento_exceptions.values()
-                else self.find_best_match(assentamento, self.df_mapping['Assentamento'])
+                else self.find_best_match(assentamento, 'Assentamento')
             )
 
-            if best_assentamento in self.assentamento_to_municipio:
-                best_municipio = self.assentamento_to_municipio[best_assentamento]
+            registro = self.referencia.buscar(best_assentamento)
+            if registro:
+                best_municipio = registro['Município']
 
-            codsipra = self.assentamento_to_codsipra.get(
-                best_assentamento,
-                'Desconhecido'
-            )
+            codsipra = registro['Codsipra'] if registro else 'Desconhecido'
 
             arquivo = os.path.basename(pdf_file)
             lote = self.extract_lote(arquivo)
@@ -250,6 +248,7 @@ def main():
         )
         df_result.to_excel(output_file, index=False)
         print(f'Planilha gerada com sucesso: {output_file}')
+        publicar_parquet(output_file)
 
     except Exception as e:
         print(f'Erro durante a execução: {str(e)}')
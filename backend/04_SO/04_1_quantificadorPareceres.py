@@ -6,28 +6,28 @@ Script para processar documentos PDF e gerar planilha com informações de assen
 
 import os
 import re
+import sys
 import pandas as pd
-import PyPDF2
-from thefuzz import process
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from extracao_pdf import CacheExtracao, DocumentoPDF  # noqa: E402
+from publicacao import publicar_parquet  # noqa: E402
+from referencia_pas import CAMINHO_REFERENCIA_PADRAO, ReferenciaPAs  # noqa: E402
 
 
 def load_mapping(csv_file):
-    """Carrega o arquivo CSV de mapeamento."""
+    """Carrega a tabela de referência de assentamentos (ou None em caso de erro)."""
     try:
-        df_mapping = pd.read_csv(csv_file)
-        return df_mapping
+        return ReferenciaPAs.carregar(csv_file)
     except Exception as e:
         print(f"Erro ao ler arquivo CSV: {str(e)}")
-        return pd.DataFrame()
+        return None
 
 
-def read_pdf_content(file_path):
+def read_pdf_content(file_path, cache=None):
     """Extrai o texto da última página de um arquivo PDF."""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            last_page = pdf_reader.pages[-1]
-            return last_page.extract_text()
+        return DocumentoPDF(file_path, cache).texto_ultima_pagina
     except Exception as e:
         print(f"Erro ao ler PDF {file_path}: {str(e)}")
         return ""
@@ -53,22 +53,18 @@ def check_document_type(content):
     return "Padrão"
 
 
-def get_assentamento_info(filename, df_mapping):
+def get_assentamento_info(filename, referencia):
     """Extrai informações do assentamento a partir do nome do arquivo."""
     try:
         nome_assentamento = filename.split('_PA')[1].split('_')[0].strip()
 
-        match = process.extractOne(
-            nome_assentamento,
-            df_mapping['Assentamento'].tolist(),
-            score_cutoff=60
-        )
+        assentamento_match, score = referencia.melhor_correspondencia(
+            nome_assentamento, 'Assentamento')
 
-        if match:
-            assentamento_match = match[0]
-            municipio = df_mapping[df_mapping['Assentamento'] == assentamento_match]['Município'].iloc[0]
-            codsipra = df_mapping[df_mapping['Assentamento'] == assentamento_match]['Codsipra'].iloc[0]
-            return assentamento_match, municipio, codsipra
+        if assentamento_match and score >= 60:
+            # Nomes repetidos na tabela ficam com a primeira linha
+            registro = referencia.buscar(assentamento_match, primeiro=True)
+            return assentamento_match, registro['Município'], registro['Codsipra']
 
     except Exception as e:
         print(f"Erro ao extrair assentamento de {filename}: {str(e)}")
@@ -76,10 +72,14 @@ def get_assentamento_info(filename, df_mapping):
     return 'N/A', 'N/A', 'N/A'
 
 
-def generate_spreadsheet_from_folder(folder_path, csv_path, output_path):
-    """Gera uma planilha com informações dos documentos PDF em uma pasta."""
-    df_mapping = load_mapping(csv_path)
-    if df_mapping.empty:
+def generate_spreadsheet_from_folder(folder_path, csv_path, output_path, cache=None):
+    """Gera uma planilha com informações dos documentos PDF em uma pasta.
+
+    Se um CacheExtracao for informado, PDFs inalterados desde a última
+    execução não são lidos novamente.
+    """
+    referencia = load_mapping(csv_path)
+    if referencia is None:
         print("Erro: Não foi possível carregar o arquivo de mapeamento.")
         return
 
@@ -94,10 +94,10 @@ def generate_spreadsheet_from_folder(folder_path, csv_path, output_path):
                     parts = filename.split('_')
                     lote = parts[0] if parts else 'N/A'
 
-                    assentamento, municipio, codsipra = get_assentamento_info(filename, df_mapping)
+                    assentamento, municipio, codsipra = get_assentamento_info(filename, referencia)
 
                     file_path = os.path.join(root, filename)
-                    content = read_pdf_content(file_path)
+                    content = read_pdf_content(file_path, cache)
                     tipo = check_document_type(content)
 
                     relative_path = os.path.relpath(root, folder_path)
@@ -128,6 +128,7 @@ def generate_spreadsheet_from_folder(folder_path, csv_path, output_path):
     try:
         df.to_excel(output_path, index=False)
         print(f"Planilha gerada com sucesso em: {output_path}")
+        publicar_parquet(output_path)
     except Exception as e:
         print(f"Erro ao salvar a planilha: {str(e)}")
 
@@ -136,10 +137,12 @@ def main():
     """Função principal que executa o script."""
     # Caminhos para os arquivos
     folder_path = 'D:/ufpr.br/Intranet do LAGEAMB - TED-INCRA/02_SO/11_municipiosPAs'
-    csv_path = 'D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes/04_SO/04_codsipraPAsMunicipios.csv'
+    csv_path = CAMINHO_REFERENCIA_PADRAO
     output_path = 'D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes/04_SO/04_contPareceres.xlsx'
 
-    generate_spreadsheet_from_folder(folder_path, csv_path, output_path)
+    with CacheExtracao() as cache:
+        generate_spreadsheet_from_folder(folder_path, csv_path, output_path, cache)
+        cache.podar(folder_path)
 
 
 if __name__ == "__main__":
@@ -2,29 +2,33 @@
 Script para processar dados de assentamentos e municípios, gerando relatório consolidado.
 """
 import os
+import sys
 import pandas as pd
-from thefuzz import process
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from publicacao import publicar_parquet  # noqa: E402
+from referencia_pas import CAMINHO_REFERENCIA_PADRAO, ReferenciaPAs  # noqa: E402
 
-def encontrar_correspondencia(nome, lista_referencia):
-    """Encontra a melhor correspondência usando fuzzy matching."""
-    match = process.extractOne(nome, lista_referencia)
-    return match[0] if match and match[1] >= 80 else None
+
+def encontrar_correspondencia(nome, campo):
+    """Encontra a melhor correspondência em um campo da referência (fuzzy)."""
+    match, score = referencia.melhor_correspondencia(nome, campo)
+    return match if score >= 80 else None
 
 
 # Caminhos das pastas
 PASTA_BASE = r"D:/ufpr.br/Intranet do LAGEAMB - TED-INCRA/02_SO/11_municipiosPAs"
 PASTA_DESTINO = r"D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes/05_SO"
 
-# Ler apenas o CSV com a coluna nomePA
-ARQUIVO_CSV = r"D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes/05_SO/05_codsipraPAsmunicipiosNomePAs.csv"
+# CSV de referência compartilhado (precisa ter a coluna nomePA)
+ARQUIVO_CSV = CAMINHO_REFERENCIA_PADRAO
 
-# Ler o CSV de referência
-df_referencia = pd.read_csv(ARQUIVO_CSV)
-print(f"Colunas do CSV: {df_referencia.columns.tolist()}")
+# Ler a tabela de referência
+referencia = ReferenciaPAs.carregar(ARQUIVO_CSV)
+print(f"Colunas do CSV: {referencia.df.columns.tolist()}")
 
 # Verificar se a coluna nomePA existe
-if 'nomePA' not in df_referencia.columns:
+if 'nomePA' not in referencia.df.columns:
     print("ERRO: A coluna 'nomePA' não foi encontrada no CSV!")
     exit(1)
 
@@ -39,12 +43,9 @@ for root, dirs, files in os.walk(PASTA_BASE):
             planilha_encontrada = True
             pasta_atual = root
 
-            # Lista única de municípios do CSV
-            municipios_ref = df_referencia['Município'].unique()
-
             # Encontrar município
             nome_pasta = os.path.basename(pasta_atual)
-            municipio = encontrar_correspondencia(nome_pasta, municipios_ref)
+            municipio = encontrar_correspondencia(nome_pasta, 'Município')
 
             if municipio:
                 print(f"Município encontrado: {municipio}")
@@ -54,23 +55,18 @@ for root, dirs, files in os.walk(PASTA_BASE):
                 # Para cada PA encontrado
                 for pa_pasta in pas_pasta:
                     # Encontrar correspondência do PA usando a coluna nomePA
-                    nomes_pas_ref = df_referencia['nomePA'].tolist()
-                    pa_nome_correspondente = encontrar_correspondencia(pa_pasta, nomes_pas_ref)
+                    pa_nome_correspondente = encontrar_correspondencia(pa_pasta, 'nomePA')
 
                     if pa_nome_correspondente:
                         print(f"PA encontrado: {pa_nome_correspondente}")
-                        # Buscar informações correspondentes no mesmo CSV
-                        pa_info = df_referencia[df_referencia['nomePA'] == pa_nome_correspondente]
-
-                        if not pa_info.empty:
-                            # Filtrar apenas os registros do município correto
-                            pa_info_municipio = pa_info[pa_info['Município'] == municipio]
-
-                            if not pa_info_municipio.empty:
-                                pa_info = pa_info_municipio
+                        # Buscar informações correspondentes, preferindo o
+                        # registro do município correto
+                        pa_info = referencia.buscar_nome_pa(
+                            pa_nome_correspondente, municipio)
 
-                            assentamento = pa_info['Assentamento'].iloc[0]
-                            codigo_sipra = pa_info['Codsipra'].iloc[0]
+                        if pa_info:
+                            assentamento = pa_info['Assentamento']
+                            codigo_sipra = pa_info['Codsipra']
 
                             resultados.append({
                                 'Município': municipio,
@@ -99,6 +95,7 @@ if resultados:
     arquivo_saida = os.path.join(PASTA_DESTINO, '05_contPlanilhas.xlsx')
     df_resultado.to_excel(arquivo_saida, index=False)
     print(f"\nArquivo salvo em: {arquivo_saida}")
+    publicar_parquet(arquivo_saida)
     print(f"Total de registros: {len(df_resultado)}")
 else:
     print("Nenhum resultado encontrado.")
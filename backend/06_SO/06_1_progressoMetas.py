@@ -0,0 +1,55 @@
+"""
+Script para gerar o retrato de progresso das metas da SO (2.1.1 … 2.4.1).
+
+Lê as planilhas já publicadas pelos códigos 01 a 05 (só as colunas usadas
+pelas metas) e grava uma linha por meta com o realizado e o total, para
+que o dashboard exiba o progresso sem abrir as planilhas completas. O
+realizado de cada execução também é acrescentado ao histórico das metas.
+Deve ser executado depois dos demais códigos.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from metas import calcular_progresso, registrar_historico  # noqa: E402
+from publicacao import publicar_parquet  # noqa: E402
+
+# Pasta com as saídas de todos os códigos (01_SO, 02_SO, ...)
+PASTA_AUTOMACOES = 'D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes'
+PASTA_DESTINO = os.path.join(PASTA_AUTOMACOES, '06_SO')
+NOME_ARQUIVO = '06_progressoMetas.xlsx'
+NOME_HISTORICO = '06_historicoMetas'
+
+
+def main(argv=None):
+    """Função principal."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        '--pasta', default=PASTA_AUTOMACOES,
+        help='Pasta de automações com as planilhas publicadas')
+    parser.add_argument(
+        '--destino', default=PASTA_DESTINO,
+        help='Pasta onde o retrato de progresso será salvo')
+    args = parser.parse_args(argv)
+
+    try:
+        progresso = calcular_progresso(
+            lambda planilha: os.path.join(args.pasta, planilha))
+    except Exception as e:
+        print(f"Erro ao calcular o progresso das metas: {e}")
+        return
+
+    os.makedirs(args.destino, exist_ok=True)
+    caminho_arquivo_excel = os.path.join(args.destino, NOME_ARQUIVO)
+    progresso.to_excel(caminho_arquivo_excel, index=False)
+    publicar_parquet(caminho_arquivo_excel)
+    registrar_historico(progresso, os.path.join(args.destino, NOME_HISTORICO))
+
+    print(progresso[['Meta', 'Realizado', 'Total']].to_string(index=False))
+    print("Progresso das metas salvo em", caminho_arquivo_excel)
+
+
+if __name__ == "__main__":
+    main()
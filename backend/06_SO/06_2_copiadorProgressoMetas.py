@@ -0,0 +1,38 @@
+import shutil
+import os
+
+# Caminhos dos arquivos
+caminho_sharepoint = 'D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes/06_SO/06_progressoMetas.xlsx'
+caminho_repositorio = 'C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so/06_progressoMetas.xlsx'
+
+# Copiar e substituir o arquivo do SharePoint para o repositório
+shutil.copyfile(caminho_sharepoint, caminho_repositorio)
+
+# Copiar também a versão em Parquet, lida mais rapidamente pelo dashboard;
+# se ela não foi gerada, remover a cópia antiga para não exibir dados velhos
+parquet_sharepoint = caminho_sharepoint.replace('.xlsx', '.parquet')
+parquet_repositorio = caminho_repositorio.replace('.xlsx', '.parquet')
+if os.path.exists(parquet_sharepoint):
+    shutil.copyfile(parquet_sharepoint, parquet_repositorio)
+elif os.path.exists(parquet_repositorio):
+    os.remove(parquet_repositorio)
+
+# Copiar os registros novos do histórico das metas; os já copiados nunca
+# mudam, então não são copiados de novo nem removidos
+historico_sharepoint = 'D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/03_equipeGEOTI/08_automacoes/06_SO/06_historicoMetas'
+historico_repositorio = 'C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so/06_historicoMetas'
+if os.path.isdir(historico_sharepoint):
+    os.makedirs(historico_repositorio, exist_ok=True)
+    for nome in os.listdir(historico_sharepoint):
+        destino = os.path.join(historico_repositorio, nome)
+        if nome.endswith('.parquet') and not os.path.exists(destino):
+            shutil.copyfile(os.path.join(historico_sharepoint, nome), destino)
+
+# Caminho para o executável do Git
+git_executable = '"C:/Program Files/Git/cmd/git.exe"'
+
+# Navegar até o diretório do repositório e executar comandos Git
+os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} pull --no-edit')
+os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} add "06_progressoMetas*" 06_historicoMetas')
+os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} commit -m "Atualização do progresso das metas"')
+os.system(f'cd C:/Users/CoordenaçãodeTidoLag/Desktop/dashboardgeral_so && {git_executable} push')
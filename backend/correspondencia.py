@@ -0,0 +1,116 @@
+"""Correspondência fuzzy de nomes com memorização e pré-filtragem de candidatos.
+
+Os scripts do backend comparam milhares de nomes extraídos de arquivos com
+a lista de ~316 assentamentos, mas os mesmos poucos nomes se repetem. O
+CorrespondenteFuzzy guarda o resultado de cada consulta (LRU) e só pontua os
+candidatos que têm algum trigrama em comum com a consulta, recorrendo à
+lista completa quando o bloco não traz uma boa correspondência. A
+pontuação é a mesma de thefuzz.process.extractOne (WRatio).
+"""
+
+from collections import OrderedDict, defaultdict
+
+from thefuzz import process
+from thefuzz import utils
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz
+    from rapidfuzz import process as rf_process
+except ImportError:  # pragma: no cover - rapidfuzz é dependência do thefuzz
+    rf_process = None
+
+
+def processar_texto(texto):
+    """Pré-processamento que o thefuzz aplica antes do WRatio.
+
+    Só ASCII, minúsculas, letras e números; duas consultas com o mesmo texto
+    processado recebem exatamente a mesma pontuação, por isso ele é a chave
+    do cache.
+    """
+    return utils.full_process(texto, force_ascii=True)
+
+
+def trigramas(texto_processado):
+    """Conjunto de trigramas do texto, ignorando os espaços."""
+    compacto = texto_processado.replace(' ', '')
+    return {compacto[i:i + 3] for i in range(len(compacto) - 2)}
+
+
+class CorrespondenteFuzzy:
+    """Encontra a opção mais parecida com um nome, como process.extractOne."""
+
+    def __init__(self, opcoes, tamanho_cache=4096, pontuacao_bloco=90):
+        """Indexa as opções por trigrama.
+
+        Args:
+            opcoes: Lista de nomes candidatos
+            tamanho_cache: Número máximo de consultas memorizadas
+            pontuacao_bloco: Se a melhor opção do bloco de candidatos ficar
+                abaixo desta pontuação, a consulta é refeita na lista completa
+        """
+        self.opcoes = list(opcoes)
+        self.tamanho_cache = tamanho_cache
+        self.pontuacao_bloco = pontuacao_bloco
+        self._cache = OrderedDict()
+        self._indice = defaultdict(set)
+        for i, opcao in enumerate(self.opcoes):
+            for trigrama in trigramas(processar_texto(opcao)):
+                self._indice[trigrama].add(i)
+
+    def _candidatos(self, consulta_processada):
+        """Opções com pelo menos um trigrama em comum, na ordem original."""
+        indices = set()
+        for trigrama in trigramas(consulta_processada):
+            indices |= self._indice.get(trigrama, set())
+        return [self.opcoes[i] for i in sorted(indices)]
+
+    def _memorizar(self, chave, resultado):
+        """Guarda o resultado, descartando a consulta usada há mais tempo."""
+        self._cache[chave] = resultado
+        if len(self._cache) > self.tamanho_cache:
+            self._cache.popitem(last=False)
+
+    def melhor(self, nome):
+        """Retorna a tupla (opção, pontuação) ou (None, 0) se não houver."""
+        if not nome or not self.opcoes:
+            return None, 0
+        chave = processar_texto(nome)
+        if chave in self._cache:
+            self._cache.move_to_end(chave)
+            return self._cache[chave]
+
+        resultado = None
+        candidatos = self._candidatos(chave)
+        if candidatos:
+            resultado = process.extractOne(nome, candidatos)
+        if resultado is None or resultado[1] < self.pontuacao_bloco:
+            resultado = process.extractOne(nome, self.opcoes)
+
+        resultado = (resultado[0], resultado[1]) if resultado else (None, 0)
+        self._memorizar(chave, resultado)
+        return resultado
+
+    def melhores(self, nomes):
+        """Resolve uma lista de nomes de uma vez, na mesma ordem.
+
+        Consultas repetidas são calculadas uma única vez; se o rapidfuzz
+        estiver disponível, as consultas ainda não memorizadas são pontuadas
+        juntas contra todas as opções com `cdist` (vetorizado e paralelo).
+        """
+        pendentes = {}
+        for nome in nomes:
+            if nome:
+                chave = processar_texto(nome)
+                if chave not in self._cache and chave not in pendentes:
+                    pendentes[chave] = nome
+
+        if pendentes and self.opcoes and rf_process is not None:
+            consultas = list(pendentes.values())
+            matriz = rf_process.cdist(
+                consultas, self.opcoes, scorer=rf_fuzz.WRatio,
+                processor=processar_texto, workers=-1)
+            for chave, linha in zip(pendentes, matriz):
+                indice = int(linha.argmax())
+                self._memorizar(chave, (self.opcoes[indice], int(round(linha[indice]))))
+
+        return [self.melhor(nome) for nome in nomes]
@@ -0,0 +1,352 @@
+"""Leitura de PDFs com cache persistente compartilhado pelos scripts do backend.
+
+O cache é um arquivo SQLite que guarda, para cada PDF, os textos de página já
+extraídos e campos derivados (data, técnico, tipo etc.). Um PDF é identificado
+pelo caminho + tamanho + data de modificação, de modo que apenas PDFs novos ou
+alterados são analisados novamente. Opcionalmente (`usar_hash=True`), a chave
+é o hash SHA-1 do conteúdo, o que reconhece PDFs renomeados ou movidos ao
+custo de ler cada arquivo novo mais uma vez por inteiro.
+
+Textos e campos de uma chave que deixou de ser usada (PDF alterado, renomeado
+fora dos scripts ou removido) são apagados, para que o banco não cresça a
+cada execução. O banco fica na pasta do usuário, fora da pasta sincronizada
+com o SharePoint.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+
+import PyPDF2
+
+CAMINHO_CACHE_PADRAO = os.path.join(os.path.expanduser('~'), '.cache_so',
+                                    'cache_extracao.sqlite')
+
+# Valor sentinela para diferenciar "campo ausente" de "campo salvo como None"
+AUSENTE = object()
+
+
+def calcular_hash_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    """Calcula o hash SHA-1 do conteúdo de um arquivo."""
+    sha1 = hashlib.sha1()
+    with open(caminho, 'rb') as file:
+        for bloco in iter(lambda: file.read(tamanho_bloco), b''):
+            sha1.update(bloco)
+    return sha1.hexdigest()
+
+
+def normalizar_caminho(caminho):
+    """Caminho absoluto e normalizado, usado como identificador no cache."""
+    return os.path.normcase(os.path.abspath(caminho))
+
+
+class CacheExtracao:
+    """Cache em disco (SQLite) de textos de página e campos extraídos de PDFs."""
+
+    def __init__(self, caminho_cache=CAMINHO_CACHE_PADRAO, usar_hash=False,
+                 intervalo_commit=200):
+        """Abre (ou cria) o banco de cache.
+
+        Args:
+            caminho_cache: Caminho do arquivo SQLite
+            usar_hash: Se True, usa o hash do conteúdo para reconhecer PDFs
+                renomeados ou movidos (lê cada PDF novo ou alterado por
+                inteiro só para calcular a chave); se False (padrão), apenas
+                caminho+tamanho+mtime
+            intervalo_commit: Número de gravações entre commits automáticos
+        """
+        self.caminho_cache = caminho_cache
+        self.usar_hash = usar_hash
+        self.intervalo_commit = intervalo_commit
+        self._gravacoes_pendentes = 0
+        pasta_cache = os.path.dirname(caminho_cache)
+        if pasta_cache:
+            os.makedirs(pasta_cache, exist_ok=True)
+        self.conexao = sqlite3.connect(caminho_cache, timeout=30)
+        self._criar_tabelas()
+
+    def _criar_tabelas(self):
+        """Cria as tabelas do cache, se ainda não existirem."""
+        self.conexao.executescript("""
+            CREATE TABLE IF NOT EXISTS arquivos (
+                caminho TEXT PRIMARY KEY,
+                tamanho INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                chave TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS paginas (
+                chave TEXT NOT NULL,
+                indice INTEGER NOT NULL,
+                texto TEXT NOT NULL,
+                PRIMARY KEY (chave, indice)
+            );
+            CREATE TABLE IF NOT EXISTS campos (
+                chave TEXT NOT NULL,
+                nome TEXT NOT NULL,
+                valor TEXT,
+                PRIMARY KEY (chave, nome)
+            );
+        """)
+        self.conexao.commit()
+
+    def chave_documento(self, caminho):
+        """Retorna a chave de cache do PDF, reconhecendo arquivos inalterados.
+
+        Se caminho, tamanho e data de modificação coincidem com o registro
+        anterior, a chave registrada é reutilizada sem ler o arquivo. Se o
+        arquivo mudou, os dados da chave anterior são apagados.
+        """
+        caminho_normalizado = normalizar_caminho(caminho)
+        stat = os.stat(caminho)
+        registro = self.conexao.execute(
+            "SELECT tamanho, mtime_ns, chave FROM arquivos WHERE caminho = ?",
+            (caminho_normalizado,)
+        ).fetchone()
+        if registro and registro[0] == stat.st_size and registro[1] == stat.st_mtime_ns:
+            return registro[2]
+
+        if self.usar_hash:
+            chave = calcular_hash_arquivo(caminho)
+        else:
+            chave = f"{caminho_normalizado}|{stat.st_size}|{stat.st_mtime_ns}"
+
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO arquivos (caminho, tamanho, mtime_ns, chave) "
+            "VALUES (?, ?, ?, ?)",
+            (caminho_normalizado, stat.st_size, stat.st_mtime_ns, chave)
+        )
+        if registro and registro[2] != chave:
+            self._apagar_se_sem_uso(registro[2])
+        self._registrar_gravacao()
+        return chave
+
+    def registrar_renomeacao(self, origem, destino):
+        """Transfere o registro de um PDF renomeado para o novo caminho.
+
+        Deve ser chamado logo após renomear o arquivo: o conteúdo não muda,
+        então os textos e campos já extraídos continuam valendo sem que o
+        PDF seja lido de novo na próxima execução.
+        """
+        origem, destino = normalizar_caminho(origem), normalizar_caminho(destino)
+        substituido = self.conexao.execute(
+            "SELECT chave FROM arquivos WHERE caminho = ?", (destino,)
+        ).fetchone()
+        cursor = self.conexao.execute(
+            "UPDATE OR REPLACE arquivos SET caminho = ? WHERE caminho = ?",
+            (destino, origem)
+        )
+        if cursor.rowcount and substituido:
+            self._apagar_se_sem_uso(substituido[0])
+        self._registrar_gravacao()
+
+    def podar(self, pasta):
+        """Apaga os registros de PDFs de `pasta` que não existem mais.
+
+        Só são verificados os caminhos dentro de `pasta` (a pasta que o
+        script acabou de percorrer), para que uma pasta de outro script
+        momentaneamente indisponível não esvazie o cache. Textos e campos
+        que ficaram sem nenhum arquivo também são apagados.
+
+        Returns:
+            Número de arquivos removidos do cache
+        """
+        prefixo = os.path.join(normalizar_caminho(pasta), '')
+        ausentes = [
+            (caminho,) for (caminho,) in self.conexao.execute("SELECT caminho FROM arquivos")
+            if caminho.startswith(prefixo) and not os.path.exists(caminho)
+        ]
+        self.conexao.executemany("DELETE FROM arquivos WHERE caminho = ?", ausentes)
+        for tabela in ('paginas', 'campos'):
+            self.conexao.execute(
+                f"DELETE FROM {tabela} WHERE chave NOT IN (SELECT chave FROM arquivos)")
+        self.salvar()
+        return len(ausentes)
+
+    def _apagar_se_sem_uso(self, chave):
+        """Apaga textos e campos de `chave` se nenhum arquivo a usa mais."""
+        em_uso = self.conexao.execute(
+            "SELECT 1 FROM arquivos WHERE chave = ? LIMIT 1", (chave,)
+        ).fetchone()
+        if not em_uso:
+            self.conexao.execute("DELETE FROM paginas WHERE chave = ?", (chave,))
+            self.conexao.execute("DELETE FROM campos WHERE chave = ?", (chave,))
+
+    def obter_texto(self, chave, indice):
+        """Retorna o texto de uma página em cache ou None."""
+        registro = self.conexao.execute(
+            "SELECT texto FROM paginas WHERE chave = ? AND indice = ?",
+            (chave, indice)
+        ).fetchone()
+        return registro[0] if registro else None
+
+    def salvar_texto(self, chave, indice, texto):
+        """Armazena o texto de uma página."""
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO paginas (chave, indice, texto) VALUES (?, ?, ?)",
+            (chave, indice, texto)
+        )
+        self._registrar_gravacao()
+
+    def obter_campo(self, chave, nome, padrao=AUSENTE):
+        """Retorna um campo derivado em cache ou `padrao` se não existir."""
+        registro = self.conexao.execute(
+            "SELECT valor FROM campos WHERE chave = ? AND nome = ?",
+            (chave, nome)
+        ).fetchone()
+        return json.loads(registro[0]) if registro else padrao
+
+    def salvar_campo(self, chave, nome, valor):
+        """Armazena um campo derivado (valor serializável em JSON)."""
+        self.conexao.execute(
+            "INSERT OR REPLACE INTO campos (chave, nome, valor) VALUES (?, ?, ?)",
+            (chave, nome, json.dumps(valor, ensure_ascii=False))
+        )
+        self._registrar_gravacao()
+
+    def _registrar_gravacao(self):
+        """Faz commit periodicamente para não perder o progresso de uma execução."""
+        self._gravacoes_pendentes += 1
+        if self._gravacoes_pendentes >= self.intervalo_commit:
+            self.salvar()
+
+    def salvar(self):
+        """Confirma as gravações pendentes no disco."""
+        self.conexao.commit()
+        self._gravacoes_pendentes = 0
+
+    def fechar(self):
+        """Salva as gravações pendentes e fecha o banco."""
+        self.salvar()
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.fechar()
+
+
+class DocumentoPDF:
+    """Representa um PDF aberto uma única vez, com textos de página memoizados.
+
+    O arquivo é lido e analisado pelo PyPDF2 apenas no primeiro acesso, e o
+    texto de cada página só é extraído quando solicitado. Se um cache for
+    informado, textos e campos já extraídos em execuções anteriores são lidos
+    dele e o PDF nem chega a ser aberto.
+    """
+
+    def __init__(self, caminho_pdf, cache=None):
+        """Guarda o caminho do PDF sem abrir o arquivo."""
+        self.caminho_pdf = caminho_pdf
+        self.cache = cache
+        self._reader = None
+        self._chave = None
+        self._num_paginas = None
+        self._textos = {}
+
+    @property
+    def chave(self):
+        """Chave do documento no cache (None se não houver cache)."""
+        if self._chave is None and self.cache is not None:
+            self._chave = self.cache.chave_documento(self.caminho_pdf)
+        return self._chave
+
+    def _obter_reader(self):
+        """Abre e analisa o PDF na primeira chamada."""
+        if self._reader is None:
+            with open(self.caminho_pdf, 'rb') as file:
+                self._reader = PyPDF2.PdfReader(io.BytesIO(file.read()))
+        return self._reader
+
+    @property
+    def num_paginas(self):
+        """Número de páginas do PDF."""
+        if self._num_paginas is None:
+            self._num_paginas = self.campo(
+                'num_paginas', lambda doc: len(doc._obter_reader().pages))
+        return self._num_paginas
+
+    def texto_pagina(self, indice):
+        """Extrai (uma única vez) o texto da página indicada."""
+        if indice < 0:
+            indice += self.num_paginas
+        if indice in self._textos:
+            return self._textos[indice]
+
+        texto = None
+        if self.cache is not None:
+            texto = self.cache.obter_texto(self.chave, indice)
+        if texto is None:
+            pagina = self._obter_reader().pages[indice]
+            texto = pagina.extract_text() or ''
+            if self.cache is not None:
+                self.cache.salvar_texto(self.chave, indice, texto)
+        self._textos[indice] = texto
+        return texto
+
+    @property
+    def texto_primeira_pagina(self):
+        """Texto da primeira página do PDF."""
+        return self.texto_pagina(0)
+
+    @property
+    def texto_ultima_pagina(self):
+        """Texto da última página do PDF."""
+        return self.texto_pagina(-1)
+
+    def texto_completo(self):
+        """Texto de todas as páginas concatenado."""
+        return ''.join(self.texto_pagina(i) for i in range(self.num_paginas))
+
+    def texto_parcial(self, padroes, limite_paginas=None):
+        """Texto das primeiras páginas, suficiente para encontrar todos os `padroes`.
+
+        As páginas são lidas na ordem do documento, e a leitura para quando
+        a primeira ocorrência de cada padrão (regex compilada) termina antes
+        da última página lida; se algum padrão não aparece, todas as páginas
+        são lidas. `limite_paginas` (None = sem limite) corta a leitura e
+        pode mudar o resultado.
+
+        O que se garante é só isso: cada ocorrência retornada tem ao menos
+        uma página inteira de texto depois dela. `padrao.search` encontra no
+        texto parcial o mesmo que no completo desde que o padrão não olhe
+        mais de uma página adiante da ocorrência: nomes em maiúsculas que
+        continuam na página seguinte estão cobertos, mas lookaheads ou
+        trechos gulosos com DOTALL que alcançam páginas posteriores não
+        estão. Os padrões do código 02_1 são verificados nos testes
+        (tests/test_renomeador_pgt.py).
+        """
+        total = self.num_paginas
+        if limite_paginas:
+            total = min(total, limite_paginas)
+
+        texto = ''
+        for indice in range(total):
+            inicio_pagina = len(texto)
+            texto += self.texto_pagina(indice)
+            ocorrencias = [padrao.search(texto) for padrao in padroes]
+            if all(ocorrencia is not None and ocorrencia.end() < inicio_pagina
+                   for ocorrencia in ocorrencias):
+                break
+        return texto
+
+    def liberar_arquivo(self):
+        """Descarta o PDF analisado, mantendo os textos já extraídos."""
+        self._reader = None
+
+    def campo(self, nome, extrator):
+        """Retorna um campo derivado, calculando-o com `extrator(self)` se necessário.
+
+        O resultado é guardado no cache (quando houver) sob `nome`; ao mudar
+        a lógica de um extrator, use um novo nome para invalidar os valores
+        antigos.
+        """
+        if self.cache is None:
+            return extrator(self)
+        valor = self.cache.obter_campo(self.chave, nome)
+        if valor is AUSENTE:
+            valor = extrator(self)
+            self.cache.salvar_campo(self.chave, nome, valor)
+        return valor
@@ -0,0 +1,169 @@
+"""Cadastro das metas da SO e cálculo do retrato de progresso.
+
+Cada produto (2.1.1 … 2.4.1) é descrito uma única vez: a planilha que o
+mede, a coluna e a condição que identificam os documentos que contam e o
+total a atingir. O código 06_1 usa este cadastro para gravar um retrato
+pequeno do progresso (06_progressoMetas.xlsx/.parquet), que o dashboard
+exibe sem precisar ler as planilhas completas. O retrato guarda a versão
+(hash) de cada planilha contada; quando a planilha do dashboard é outra
+versão, o dashboard calcula o progresso com este mesmo cadastro.
+
+A cada execução o realizado também é acrescentado ao histórico
+(06_historicoMetas/): uma pasta de Parquets, um arquivo por execução, que
+nunca são alterados depois de gravados. O dashboard lê só essa pasta para
+mostrar a evolução das metas e a previsão de conclusão.
+"""
+
+import os
+from collections import namedtuple
+from datetime import datetime
+
+import pandas as pd
+
+from publicacao import caminho_parquet, versao_publicada
+
+# Planilhas publicadas, relativas à pasta de automações
+PLANILHA_LAUDOS = '01_SO/01_laudos_SO_infos.xlsx'
+PLANILHA_PGT = '02_SO/02_contPGT.xlsx'
+PLANILHA_PARECERES = '04_SO/04_contPareceres.xlsx'
+PLANILHA_PLANILHAS = '05_SO/05_contPlanilhas.xlsx'
+
+# condicao: ('igual', valor), ('contem', trecho) ou None (todas as linhas)
+Meta = namedtuple('Meta', ['codigo', 'descricao', 'planilha', 'coluna', 'condicao', 'total'])
+
+METAS = [
+    Meta('2.1.1', 'Vistoria in loco', PLANILHA_LAUDOS,
+         'Modalidade', ('igual', 'VISTORIA IN LOCO'), 4739),
+    Meta('2.1.2', 'Mutirão', PLANILHA_LAUDOS,
+         'Modalidade', ('igual', 'MUTIRÃO'), 2746),
+    Meta('2.2.1', 'Relatório de conformidades para regularização', PLANILHA_PGT,
+         'Tipo de documento PGT',
+         ('igual', 'Relatório de conformidades para regularização'), 2246),
+    Meta('2.2.2', 'Solicitação de documentação complementar', PLANILHA_PGT,
+         'Tipo de documento PGT',
+         ('igual', 'Solicitação de documentação complementar'), 674),
+    Meta('2.2.3', 'Segundos relatórios de conformidades para regularização', PLANILHA_PGT,
+         'Tipo de documento PGT', ('contem', '2º Relatório'), 337),
+    Meta('2.2.4', 'Análise para regularização', PLANILHA_PGT,
+         'Tipo de documento PGT', ('igual', 'Análise para regularização'), 1622),
+    Meta('2.3.1', 'Pareceres de beneficiário', PLANILHA_PARECERES,
+         'Tipo', ('igual', 'Padrão'), 4239),
+    Meta('2.3.2', 'Pareceres para desbloqueio', PLANILHA_PARECERES,
+         'Tipo', ('igual', 'Desbloqueio'), 500),
+    Meta('2.4.1', 'Planilhas de monitoramento de assentamento', PLANILHA_PLANILHAS,
+         None, None, 129),
+]
+
+COLUNAS_PROGRESSO = ['Meta', 'Descrição', 'Planilha', 'Realizado', 'Total', 'Atualizado em',
+                     'Versão']
+
+
+def atende(condicao, valor):
+    """Indica se um valor da coluna atende à condição de uma meta."""
+    tipo, referencia = condicao
+    if tipo == 'igual':
+        return valor == referencia
+    if tipo == 'contem':
+        return isinstance(valor, str) and referencia in valor
+    raise ValueError(f"Condição desconhecida: {tipo}")
+
+
+def contar_realizado(contagem, condicao):
+    """Soma as quantidades dos valores que atendem à condição de uma meta.
+
+    Args:
+        contagem: Series valor -> quantidade (ex.: `df[coluna].value_counts()`)
+        condicao: Condição da meta (ver METAS)
+    """
+    return int(sum(quantidade for valor, quantidade in contagem.items()
+                   if atende(condicao, valor)))
+
+
+def ler_colunas(caminho_xlsx, colunas):
+    """Lê só as colunas indicadas da planilha publicada (Parquet, se houver)."""
+    parquet = caminho_parquet(caminho_xlsx)
+    if os.path.exists(parquet):
+        return pd.read_parquet(parquet, columns=colunas or None)
+    return pd.read_excel(caminho_xlsx, usecols=colunas or None)
+
+
+def calcular_progresso(localizar, metas=METAS, ler=ler_colunas):
+    """Calcula o realizado de cada meta.
+
+    Cada planilha é lida uma vez, apenas com as colunas usadas pelas metas,
+    e cada coluna é contada uma única vez (value_counts). A coluna 'Versão'
+    identifica a planilha publicada que foi contada (ver
+    `publicacao.versao_publicada`).
+
+    Args:
+        localizar: Função que recebe a planilha da meta e retorna o caminho
+        metas: Metas a calcular
+        ler: Função (caminho, colunas) -> DataFrame; o dashboard passa os
+            dados que já carregou (o DataFrame não é alterado)
+
+    Returns:
+        DataFrame com as colunas de COLUNAS_PROGRESSO, uma linha por meta
+    """
+    atualizado_em = datetime.now().strftime('%d/%m/%Y %H:%M')
+    contagens = {}
+    linhas = {}
+    versoes = {}
+    for planilha in dict.fromkeys(meta.planilha for meta in metas):
+        colunas = sorted({meta.coluna for meta in metas
+                          if meta.planilha == planilha and meta.coluna})
+        caminho = localizar(planilha)
+        # Nomes de coluna com espaços sobrando, como na planilha 5
+        df = ler(caminho, colunas).rename(columns=str.strip)
+        linhas[planilha] = len(df)
+        versoes[planilha] = versao_publicada(caminho)
+        for coluna in colunas:
+            contagens[planilha, coluna] = df[coluna].value_counts()
+
+    registros = []
+    for meta in metas:
+        if meta.coluna is None:
+            realizado = linhas[meta.planilha]
+        else:
+            realizado = contar_realizado(
+                contagens[meta.planilha, meta.coluna], meta.condicao)
+        registros.append([meta.codigo, meta.descricao, os.path.basename(meta.planilha),
+                          realizado, meta.total, atualizado_em, versoes[meta.planilha]])
+    return pd.DataFrame(registros, columns=COLUNAS_PROGRESSO)
+
+
+def registrar_historico(progresso, pasta, momento=None):
+    """Acrescenta ao histórico o realizado de cada meta nesta execução.
+
+    Cada execução grava um novo Parquet na pasta do histórico, nomeado pela
+    data e hora (ex.: 20261018_153200.parquet), com as colunas Momento,
+    Meta, Realizado e Total; os arquivos anteriores não são tocados.
+
+    Args:
+        progresso: Retrato calculado por `calcular_progresso`
+        pasta: Pasta do histórico
+        momento: Data e hora da execução (padrão: agora)
+
+    Returns:
+        Caminho do arquivo gravado ou None
+    """
+    momento = (momento or datetime.now()).replace(microsecond=0)
+    registro = pd.DataFrame({
+        'Momento': pd.Timestamp(momento),
+        'Meta': progresso['Meta'].astype(str),
+        'Realizado': progresso['Realizado'].astype('int32'),
+        'Total': progresso['Total'].astype('int32'),
+    })
+    destino = os.path.join(pasta, f"{momento:%Y%m%d_%H%M%S}.parquet")
+    if os.path.exists(destino):
+        print(f"O histórico já tem um registro para {momento}; nada foi gravado")
+        return None
+    try:
+        os.makedirs(pasta, exist_ok=True)
+        registro.to_parquet(destino, index=False)
+    except Exception as e:
+        print(f"Não foi possível gravar o histórico das metas ({e})")
+        if os.path.exists(destino):
+            os.remove(destino)
+        return None
+    print(f"Histórico das metas atualizado em: {destino}")
+    return destino
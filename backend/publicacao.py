@@ -0,0 +1,122 @@
+"""Publicação das planilhas geradas pelo backend para o dashboard.
+
+Além do .xlsx (usado pela equipe no SharePoint), cada planilha é gravada
+também em Parquet, ao lado do .xlsx e com o mesmo nome. O dashboard lê o
+Parquet quando ele existe, o que é muito mais rápido que abrir o Excel.
+
+Para as planilhas com gráficos mais pesados, é gravado também um cubo de
+contagens (`<nome>_cubo.parquet`): uma linha por combinação das colunas
+usadas nos gráficos, com a quantidade de linhas da planilha em
+'Quantidade'. As datas entram no cubo pelo mês e colunas que identificam
+quase um documento por linha ficam de fora, para que o tamanho do cubo não
+acompanhe o número de documentos. Os gráficos somam fatias do cubo em vez
+de contar documentos.
+
+Os nomes dos arquivos e o cubo são definidos só aqui: o dashboard importa
+estas funções (carregador_dados.py e cubo.py) para ler o que o backend
+publica, de forma que os dois lados não podem divergir.
+"""
+
+import hashlib
+import os
+
+import pandas as pd
+
+
+def caminho_parquet(caminho_xlsx):
+    """Caminho do arquivo Parquet correspondente a uma planilha .xlsx."""
+    return os.path.splitext(caminho_xlsx)[0] + '.parquet'
+
+
+def arquivo_publicado(caminho_xlsx):
+    """Arquivo lido para a planilha publicada: o Parquet, se houver, ou o .xlsx."""
+    parquet = caminho_parquet(caminho_xlsx)
+    return parquet if os.path.exists(parquet) else caminho_xlsx
+
+
+def hash_conteudo(arquivo, tamanho_bloco=1 << 20):
+    """Hash SHA-1 do conteúdo de um arquivo."""
+    sha1 = hashlib.sha1()
+    with open(arquivo, 'rb') as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b''):
+            sha1.update(bloco)
+    return sha1.hexdigest()
+
+
+def versao_publicada(caminho_xlsx):
+    """Versão da planilha publicada (hash do arquivo lido), a mesma usada no dashboard."""
+    return hash_conteudo(arquivo_publicado(caminho_xlsx))
+
+
+def caminho_cubo(caminho_xlsx):
+    """Caminho do cubo de contagens correspondente a uma planilha .xlsx."""
+    return os.path.splitext(caminho_xlsx)[0] + '_cubo.parquet'
+
+
+def mes_da_data(datas):
+    """Reduz datas 'dd/mm/aaaa' (ou já convertidas) ao primeiro dia do mês ('01/mm/aaaa')."""
+    return pd.to_datetime(datas, format='%d/%m/%Y').dt.strftime('01/%m/%Y')
+
+
+def montar_cubo(df, dimensoes, colunas_mensais=()):
+    """Quantidade de linhas de `df` por combinação das `dimensoes`.
+
+    As datas das `colunas_mensais` são reduzidas ao mês (ver `mes_da_data`).
+    As combinações ficam na ordem em que aparecem pela primeira vez e os
+    valores vazios são mantidos, como nas contagens feitas no dashboard.
+    Em colunas categóricas (dados preparados pelo dashboard), só entram as
+    categorias presentes.
+    """
+    df = df.assign(**{coluna: mes_da_data(df[coluna]) for coluna in colunas_mensais})
+    return df.groupby(list(dimensoes), sort=False, dropna=False, observed=True).size(
+    ).reset_index(name='Quantidade')
+
+
+def tipar_colunas(df):
+    """Converte para texto as colunas que misturam tipos (ex.: números e 'N/A').
+
+    O Parquet exige um tipo por coluna; colunas homogêneas são mantidas.
+    """
+    df = df.copy()
+    for coluna in df.columns:
+        if df[coluna].dtype == object:
+            valores = df[coluna].dropna()
+            if valores.map(type).nunique() > 1:
+                df[coluna] = df[coluna].where(df[coluna].isna(), df[coluna].astype(str))
+    return df
+
+
+def publicar_parquet(caminho_xlsx, dimensoes_cubo=None, colunas_mensais=()):
+    """Grava a cópia em Parquet da planilha `caminho_xlsx`, já salva.
+
+    A cópia é feita a partir do próprio .xlsx, para que o dashboard receba
+    exatamente os mesmos valores e tipos que leria do Excel (ex.: textos
+    vazios viram nulos e lotes como '05' viram números). Se a gravação
+    falhar (ex.: pyarrow não instalado), o Parquet antigo é removido para
+    que o dashboard volte a ler o .xlsx atualizado.
+
+    Args:
+        caminho_xlsx: Planilha publicada
+        dimensoes_cubo: Colunas do cubo de contagens (None para não gravar)
+        colunas_mensais: Colunas de data do cubo agregadas por mês
+
+    Returns:
+        Caminho do Parquet gravado ou None
+    """
+    destino = caminho_parquet(caminho_xlsx)
+    destino_cubo = caminho_cubo(caminho_xlsx)
+    try:
+        df = tipar_colunas(pd.read_excel(caminho_xlsx))
+        df.to_parquet(destino, index=False)
+        print(f"Cópia em Parquet salva em: {destino}")
+        if dimensoes_cubo:
+            montar_cubo(df, dimensoes_cubo, colunas_mensais).to_parquet(
+                destino_cubo, index=False)
+            print(f"Cubo de contagens salvo em: {destino_cubo}")
+        return destino
+    except Exception as e:
+        print(f"Não foi possível gravar o Parquet ({e}); o dashboard usará o .xlsx")
+        for caminho in (destino, destino_cubo):
+            if os.path.exists(caminho):
+                os.remove(caminho)
+        return None
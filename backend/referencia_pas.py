@@ -0,0 +1,159 @@
+"""Tabela de referência de assentamentos compartilhada pelos scripts do backend.
+
+Carrega uma única vez o CSV com Codsipra, Assentamento, Município e nomePA,
+monta índices por nome normalizado, Codsipra e nomePA e atende buscas exatas
+e por similaridade (fuzzy). Os índices prontos são gravados em um snapshot
+pickle ao lado do CSV, de modo que as execuções seguintes não precisam
+reprocessar o CSV enquanto ele não mudar.
+"""
+
+import os
+import pickle
+import unicodedata
+
+import pandas as pd
+
+from correspondencia import CorrespondenteFuzzy
+
+CAMINHO_REFERENCIA_PADRAO = ('D:/ufpr.br/Intranet do LAGEAMB - TRANSVERSAIS/'
+                             '03_equipeGEOTI/08_automacoes/'
+                             'codsipraPAsMunicipiosNomePAs.csv')
+
+# Incrementar ao mudar a estrutura da classe, para descartar snapshots antigos
+VERSAO_SNAPSHOT = 2
+
+
+def normalizar_nome(texto):
+    """Remove acentos, converte para maiúsculas e padroniza os espaços."""
+    if not isinstance(texto, str):
+        return ''
+    sem_acentos = ''.join(
+        ch for ch in unicodedata.normalize('NFKD', texto)
+        if not unicodedata.combining(ch)
+    )
+    return ' '.join(sem_acentos.upper().split())
+
+
+class ReferenciaPAs:
+    """Índices da tabela de assentamentos para buscas exatas e fuzzy."""
+
+    def __init__(self, df_referencia):
+        """Monta os índices a partir do DataFrame de referência."""
+        self.df = df_referencia.reset_index(drop=True)
+        self.registros = self.df.to_dict('records')
+
+        self.por_assentamento = {}
+        self.por_codsipra = {}
+        self.por_nome_pa = {}
+        for registro in self.registros:
+            chave = normalizar_nome(registro['Assentamento'])
+            self.por_assentamento.setdefault(chave, []).append(registro)
+            self.por_codsipra.setdefault(registro['Codsipra'], registro)
+            if 'nomePA' in registro:
+                self.por_nome_pa.setdefault(registro['nomePA'], []).append(registro)
+
+        # Listas de opções para correspondência fuzzy, na ordem do CSV
+        self.assentamentos = self.df['Assentamento'].tolist()
+        self.municipios = self.df['Município'].unique().tolist()
+        self.nomes_pa = self.df['nomePA'].tolist() if 'nomePA' in self.df else []
+        self._correspondentes = {}
+
+    @classmethod
+    def carregar(cls, caminho_csv=CAMINHO_REFERENCIA_PADRAO, usar_snapshot=True):
+        """Carrega a referência, usando o snapshot pickle se o CSV não mudou."""
+        caminho_snapshot = os.path.splitext(caminho_csv)[0] + '.pkl'
+        stat = os.stat(caminho_csv)
+        assinatura = (VERSAO_SNAPSHOT, stat.st_size, stat.st_mtime_ns)
+
+        if usar_snapshot and os.path.exists(caminho_snapshot):
+            try:
+                with open(caminho_snapshot, 'rb') as file:
+                    snapshot = pickle.load(file)
+                if snapshot['assinatura'] == assinatura:
+                    return snapshot['referencia']
+            except Exception as e:
+                print(f"Snapshot de referência ignorado ({e})")
+
+        referencia = cls(pd.read_csv(caminho_csv))
+        print(f"Tabela de referência carregada: {len(referencia.registros)} assentamentos")
+
+        if usar_snapshot:
+            try:
+                with open(caminho_snapshot, 'wb') as file:
+                    pickle.dump({'assinatura': assinatura, 'referencia': referencia},
+                                file, protocol=pickle.HIGHEST_PROTOCOL)
+            except OSError as e:
+                print(f"Não foi possível gravar o snapshot de referência: {e}")
+        return referencia
+
+    def buscar(self, assentamento, municipio=None, primeiro=False):
+        """Busca exata (sem acentos/maiúsculas) de um assentamento.
+
+        Se houver mais de um assentamento com o mesmo nome, o município
+        desempata; sem ele (ou se nenhum for do município), retorna o último
+        da tabela, como o dicionário nome -> linha usado pelos códigos 01_1,
+        02_2 e 03_1, ou o primeiro com `primeiro=True`, como o `.iloc[0]`
+        usado pelo código 04_1.
+
+        Returns:
+            Dicionário com a linha da tabela ou None
+        """
+        registros = self.por_assentamento.get(normalizar_nome(assentamento))
+        if not registros:
+            return None
+        if municipio is not None:
+            municipio_normalizado = normalizar_nome(municipio)
+            for registro in registros:
+                if normalizar_nome(registro['Município']) == municipio_normalizado:
+                    return registro
+        return registros[0] if primeiro else registros[-1]
+
+    def buscar_codsipra(self, codsipra):
+        """Busca exata pelo código SIPRA."""
+        return self.por_codsipra.get(codsipra)
+
+    def buscar_nome_pa(self, nome_pa, municipio=None):
+        """Busca exata pelo nomePA (ex.: PAPINGODEOURO)."""
+        registros = self.por_nome_pa.get(nome_pa)
+        if not registros:
+            return None
+        if municipio is not None:
+            for registro in registros:
+                if registro['Município'] == municipio:
+                    return registro
+        return registros[0]
+
+    def municipio(self, assentamento, padrao='Desconhecido'):
+        """Município de um assentamento ou `padrao` se não encontrado."""
+        registro = self.buscar(assentamento)
+        return registro['Município'] if registro else padrao
+
+    def codsipra(self, assentamento, padrao='Desconhecido'):
+        """Código SIPRA de um assentamento ou `padrao` se não encontrado."""
+        registro = self.buscar(assentamento)
+        return registro['Codsipra'] if registro else padrao
+
+    def correspondente(self, campo='Assentamento'):
+        """CorrespondenteFuzzy (criado uma única vez) para a lista de um campo."""
+        if campo not in self._correspondentes:
+            opcoes = {'Assentamento': self.assentamentos,
+                      'Município': self.municipios,
+                      'nomePA': self.nomes_pa}[campo]
+            self._correspondentes[campo] = CorrespondenteFuzzy(opcoes)
+        return self._correspondentes[campo]
+
+    def melhor_correspondencia(self, nome, campo='Assentamento'):
+        """Busca fuzzy de `nome` entre os valores de um campo da referência.
+
+        Args:
+            nome: Nome a procurar
+            campo: 'Assentamento', 'Município' ou 'nomePA'
+
+        Returns:
+            Tupla (opção, pontuação) ou (None, 0) se `nome` for vazio
+        """
+        return self.correspondente(campo).melhor(nome)
+
+    def correspondencias(self, nomes, campo='Assentamento'):
+        """Versão em lote de `melhor_correspondencia`, na ordem de `nomes`."""
+        return self.correspondente(campo).melhores(nomes)
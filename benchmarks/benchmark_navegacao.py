@@ -0,0 +1,77 @@
+"""Mede o tempo de rerun do dashboard com abas calculadas sob demanda.
+
+Compara o main.py atual, que executa apenas a aba selecionada, com o
+layout antigo em st.tabs, que executava as cinco abas a cada interação.
+Os dados já estão em cache quando o tempo começa a ser medido, de forma que
+o resultado reflete o custo de um rerun (clique em um filtro), não o da
+primeira carga.
+
+Uso (na raiz do repositório):
+    python benchmarks/benchmark_navegacao.py [repeticoes]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def app_todas_as_abas():
+    """Layout anterior: as cinco abas em st.tabs, todas executadas."""
+    import streamlit as st
+    from a_dashboard_laudos import show_dashboard as laudos
+    from b_dashboard_documentos import show_dashboard as documentos
+    from c_dashboard_docs_recebidos import show_dashboard as docs_recebidos
+    from d_dashboard_pareceres import show_dashboard as pareceres
+    from e_dashboard_planilhas import show_dashboard as planilhas
+
+    st.title("Dashboard Supervisão Ocupacional - TED INCRA/UFPR")
+    abas = st.tabs(["2.1", "2.2", "2.2.1.1", "2.3", "2.4"])
+    for aba, show_dashboard in zip(abas, [laudos, documentos, docs_recebidos,
+                                          pareceres, planilhas]):
+        with aba:
+            show_dashboard()
+
+
+def medir_reruns(app, repeticoes):
+    """Executa o app uma vez (aquecendo o cache) e mede `repeticoes` reruns."""
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        app.run()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main():
+    """Imprime a mediana do tempo de rerun de cada layout."""
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    os.chdir(RAIZ)
+    sys.path.insert(0, RAIZ)
+
+    antigo = medir_reruns(
+        AppTest.from_function(app_todas_as_abas, default_timeout=120), repeticoes)
+    print(f"st.tabs (5 abas calculadas): {antigo * 1000:8.1f} ms por rerun")
+
+    from main import ABAS
+    tempos = []
+    for aba in ABAS:
+        app = AppTest.from_file(os.path.join(RAIZ, 'main.py'), default_timeout=120)
+        app.session_state['aba'] = aba
+        tempo = medir_reruns(app, repeticoes)
+        tempos.append(tempo)
+        print(f"{aba:<30} {tempo * 1000:8.1f} ms por rerun")
+
+    media = statistics.mean(tempos)
+    print(f"Média por aba: {media * 1000:.1f} ms ({media / antigo:.0%} do layout com st.tabs)")
+
+
+if __name__ == "__main__":
+    main()
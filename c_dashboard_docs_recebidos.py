@@ -1,39 +1,36 @@
 """Dashboard para visualização de documentos recebidos de assentados e NMRFs - Etapa 2.2.1.1"""
 
-import unicodedata
-
-import pandas as pd
-import plotly.express as px
 import streamlit as st
 
+from carregador_dados import carregar_planilha, rotulo_versao, versao_planilha
+from filtros import aplicar_filtros
+from graficos import figura_pizza
+from tabela import tabela_paginada
+from texto import remover_acentos
+
+FILE_PATH = '03_contDocsRecebidos.xlsx'
 
-def remove_special_chars(text):
-    """Remove caracteres especiais e acentos de um texto."""
-    if not isinstance(text, str):
-        return text
-    return ''.join(
-        ch for ch in unicodedata.normalize('NFKD', text) 
-        if not unicodedata.combining(ch)
-    )
 
+def prepare_data(df_docs):
+    """Remove os acentos de Município e Assentamento, para facilitar a manipulação."""
+    df_docs['Município'] = remover_acentos(df_docs['Município'])
+    df_docs['Assentamento'] = remover_acentos(df_docs['Assentamento'])
+    return df_docs
 
-@st.cache_data
-def load_data():
-    """Carrega os dados do arquivo Excel e armazena em cache."""
-    return pd.read_excel('03_contDocsRecebidos.xlsx')
+
+def load_data(version):
+    """Carrega os dados da planilha (Parquet, se houver), preparados uma vez por versão."""
+    return carregar_planilha(FILE_PATH, version, prepare_data)
 
 
 def show_dashboard():
     """Exibe o dashboard com os dados de documentos recebidos."""
     st.header("Etapa 2.2.1.1 da meta 2.2")
-    df_docs = load_data()
+    st.caption(f"Dados: {rotulo_versao(FILE_PATH)}")
+    df_docs = load_data(versao_planilha(FILE_PATH))
 
     st.subheader("Documentos recebidos de assentados e NMRFs")
 
-    # Remover caracteres especiais para facilitar a manipulação
-    df_docs['Município'] = df_docs['Município'].apply(remove_special_chars)
-    df_docs['Assentamento'] = df_docs['Assentamento'].apply(remove_special_chars)
-
     # Filtros para seleção
     municipios = ['Todos'] + sorted(df_docs['Município'].unique())
     assentamentos = ['Todos'] + sorted(df_docs['Assentamento'].unique())
@@ -55,19 +52,17 @@ def show_dashboard():
         key="lote_docs"
     )
 
-    # Aplicar filtros
-    if selected_municipio != "Todos":
-        df_docs = df_docs[df_docs['Município'] == selected_municipio]
-
-    if selected_assentamento != "Todos":
-        df_docs = df_docs[df_docs['Assentamento'] == selected_assentamento]
-
-    if selected_lote != "Todos":
-        df_docs = df_docs[df_docs['Lote'] == selected_lote]
+    # Aplicar filtros (uma única máscara combinada)
+    df_docs = aplicar_filtros(df_docs, {
+        'Município': selected_municipio,
+        'Assentamento': selected_assentamento,
+        'Lote': selected_lote,
+    })
 
     # Quadro total de arquivos por município e total geral
     st.subheader("Total de Arquivos por Município")
-    total_por_municipio = df_docs['Município'].value_counts().reset_index()
+    municipio_data = df_docs['Município'].value_counts()
+    total_por_municipio = municipio_data.reset_index()
     total_por_municipio.columns = ['Município', 'Quantidade de Arquivos']
     st.write(total_por_municipio)
 
@@ -76,25 +71,18 @@ def show_dashboard():
 
     # Gráfico de pizza para distribuição de arquivos por município
     st.subheader("Distribuição de Arquivos por Município")
-    fig_municipio = px.pie(
-        df_docs, 
-        names='Município', 
-        title='Distribuição por Município'
-    )
-    st.plotly_chart(fig_municipio)
+    fig_municipio = figura_pizza(municipio_data, 'Distribuição por Município')
+    st.plotly_chart(fig_municipio, key="docs_recebidos_municipio")
 
     # Gráfico de pizza para distribuição de arquivos por assentamento
     st.subheader("Distribuição de Arquivos por Assentamento")
-    fig_assentamento = px.pie(
-        df_docs, 
-        names='Assentamento', 
-        title='Distribuição por Assentamento'
-    )
-    st.plotly_chart(fig_assentamento)
+    fig_assentamento = figura_pizza(
+        df_docs['Assentamento'].value_counts(), 'Distribuição por Assentamento')
+    st.plotly_chart(fig_assentamento, key="docs_recebidos_assentamento")
 
     # Relação geral de documentos
     st.subheader("Relação Geral de Documentos")
-    st.write(df_docs)
+    tabela_paginada(df_docs, 'docs_recebidos')
 
 
 if __name__ == "__main__":
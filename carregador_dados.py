@@ -0,0 +1,107 @@
+"""Leitura das planilhas publicadas pelo backend para o dashboard.
+
+Todas as abas carregam seus dados por `carregar_planilha`, com o preparo
+próprio de cada aba, e os dados ficam em cache pela versão do arquivo lido
+(nome e hash do conteúdo). Quando um copiador publica uma planilha nova, só
+o conjunto de dados que mudou é relido, sem reiniciar o app; um arquivo
+apenas tocado (mesmo conteúdo, outra data) continua usando o cache.
+"""
+
+import functools
+import os
+import sys
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+# Nomes dos arquivos publicados, definidos uma única vez no backend
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+from publicacao import arquivo_publicado, caminho_parquet, hash_conteudo  # noqa: E402
+
+
+@functools.lru_cache(maxsize=32)
+def hash_arquivo(arquivo, mtime_ns, tamanho):
+    """Hash do conteúdo do arquivo, calculado uma vez por data e tamanho."""
+    return hash_conteudo(arquivo)
+
+
+def versao_planilha(caminho_xlsx):
+    """Identifica a versão do arquivo que será lido (Parquet ou .xlsx).
+
+    Usada como argumento das funções cacheadas, para que uma nova versão
+    da planilha gere uma nova entrada de cache. A data e o tamanho só
+    decidem quando o hash precisa ser recalculado.
+
+    Returns:
+        Tupla (arquivo, hash do conteúdo)
+    """
+    arquivo = arquivo_publicado(caminho_xlsx)
+    stat = os.stat(arquivo)
+    return arquivo, hash_arquivo(arquivo, stat.st_mtime_ns, stat.st_size)
+
+
+def rotulo_versao(caminho_xlsx):
+    """Texto com o arquivo, a data de modificação e o hash da versão carregada."""
+    arquivo, hash_conteudo = versao_planilha(caminho_xlsx)
+    modificado = datetime.fromtimestamp(os.path.getmtime(arquivo))
+    return (f"{os.path.basename(arquivo)} · atualizado em "
+            f"{modificado:%d/%m/%Y %H:%M} · versão {hash_conteudo[:8]}")
+
+
+def ler_planilha(caminho_xlsx):
+    """Lê a planilha, preferindo a cópia em Parquet publicada pelo backend.
+
+    O Parquet é lido com memory map, muito mais rápido que o openpyxl; se ele
+    não existir ou não puder ser lido, o .xlsx é usado.
+    """
+    parquet = caminho_parquet(caminho_xlsx)
+    if os.path.exists(parquet):
+        try:
+            return pd.read_parquet(parquet, memory_map=True)
+        except Exception:
+            pass
+    return pd.read_excel(caminho_xlsx)
+
+
+def carregar_planilha(caminho_xlsx, versao, preparar=None, compartilhada=False):
+    """Planilha de uma aba em cache por arquivo e versão (ver `versao_planilha`).
+
+    Todas as abas carregam seus dados por aqui. `preparar(df)` é o preparo
+    próprio da aba (limpeza, tipos), feito uma vez por versão; o cache
+    guarda só o resultado preparado.
+
+    Args:
+        caminho_xlsx: Planilha publicada
+        versao: Versão retornada por `versao_planilha(caminho_xlsx)`
+        preparar: Função que recebe e retorna o DataFrame (opcional)
+        compartilhada: Se True, todas as sessões recebem o mesmo objeto
+            (st.cache_resource), que não deve ser alterado; se False, cada
+            chamada recebe uma cópia (st.cache_data)
+
+    Returns:
+        DataFrame com os dados (preparados) da planilha
+    """
+    preparo = f"{preparar.__module__}.{preparar.__qualname__}" if preparar else None
+    carregar = _planilha_compartilhada if compartilhada else _planilha
+    return carregar(caminho_xlsx, versao, preparo, preparar)
+
+
+def _ler_e_preparar(caminho_xlsx, preparar):
+    """Lê a planilha e aplica o preparo da aba, se houver."""
+    df = ler_planilha(caminho_xlsx)
+    return preparar(df) if preparar else df
+
+
+# O preparo entra na chave do cache pelo nome (`preparo`); a própria função
+# (`_preparar`) não é hasheada.
+@st.cache_data(max_entries=10)
+def _planilha(caminho_xlsx, versao, preparo, _preparar):
+    """Planilha preparada em st.cache_data (uma cópia por chamada)."""
+    return _ler_e_preparar(caminho_xlsx, _preparar)
+
+
+@st.cache_resource(max_entries=4)
+def _planilha_compartilhada(caminho_xlsx, versao, preparo, _preparar):
+    """Planilha preparada em st.cache_resource (compartilhada, sem cópia)."""
+    return _ler_e_preparar(caminho_xlsx, _preparar)
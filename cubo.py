@@ -0,0 +1,53 @@
+"""Cubo de contagens usado pelos gráficos do dashboard.
+
+O backend publica, ao lado da planilha, um `<nome>_cubo.parquet` com uma
+linha por combinação das colunas dos gráficos (datas reduzidas ao mês) e a
+quantidade de linhas da planilha em 'Quantidade'. Os gráficos filtram o
+cubo e somam a quantidade, em vez de contar os documentos um a um; filtros
+que o cubo não consegue responder (colunas fora dele ou períodos que
+cortam um mês) são aplicados à planilha (ver `montar_cubo`).
+"""
+
+import os
+
+import pandas as pd
+
+from carregador_dados import caminho_parquet, ler_planilha
+# Nome do cubo e montagem do cubo iguais aos do backend (pasta backend
+# incluída no sys.path por carregador_dados)
+from publicacao import caminho_cubo, montar_cubo
+
+
+def ler_cubo(caminho_xlsx, dimensoes, colunas_mensais=()):
+    """Lê o cubo publicado pelo backend ou o monta a partir da planilha.
+
+    O cubo publicado só é usado se tiver as colunas esperadas e somar o
+    mesmo número de linhas do Parquet da planilha; caso contrário (cubo
+    ausente ou de outra versão), ele é montado aqui.
+    """
+    cubo_path = caminho_cubo(caminho_xlsx)
+    parquet = caminho_parquet(caminho_xlsx)
+    if os.path.exists(cubo_path) and os.path.exists(parquet):
+        try:
+            cubo = pd.read_parquet(cubo_path)
+            linhas = len(pd.read_parquet(parquet, columns=[dimensoes[0]]))
+            if (list(cubo.columns) == list(dimensoes) + ['Quantidade']
+                    and cubo['Quantidade'].sum() == linhas):
+                return cubo
+        except Exception:
+            pass
+    return montar_cubo(ler_planilha(caminho_xlsx), dimensoes, colunas_mensais)
+
+
+def contar(cubo, coluna):
+    """Equivale a `df[coluna].value_counts()`, somando a quantidade do cubo.
+
+    Antes de ordenar pela contagem, os valores seguem a mesma ordem do
+    value_counts (a das categorias, em colunas categóricas, ou a de
+    aparição), para que empates fiquem na mesma ordem.
+    """
+    categorica = isinstance(cubo[coluna].dtype, pd.CategoricalDtype)
+    contagem = cubo.groupby(coluna, sort=categorica, observed=False)['Quantidade'].sum()
+    contagem = contagem.sort_values(ascending=False, kind='stable')
+    contagem.name = 'count'
+    return contagem
@@ -1,21 +1,36 @@
 """Dashboard para visualização de produtos da meta 2.3 - Pareceres conclusivos."""
 
-import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from carregador_dados import carregar_planilha, rotulo_versao, versao_planilha
+from filtros import aplicar_filtros
+from graficos import figura_pizza
+# Cadastro de metas do backend (pasta incluída no sys.path por carregador_dados)
+from metas import METAS, PLANILHA_PARECERES, contar_realizado
+from progresso import barra_progresso, progresso_planilha
+from tabela import tabela_paginada
 
-@st.cache_data
-def load_data():
-    """Carrega os dados do arquivo Excel e armazena em cache."""
-    return pd.read_excel('04_contPareceres.xlsx')
+FILE_PATH = '04_contPareceres.xlsx'
+
+# Cartões com os pareceres filtrados que contam para cada meta, pelas
+# condições do cadastro de metas do backend (backend/metas.py)
+CARTOES = {'2.3.1': 'Padrão', '2.3.2': 'Desbloqueio'}
+METAS_CARTOES = [meta for meta in METAS
+                 if meta.planilha == PLANILHA_PARECERES and meta.codigo in CARTOES]
+
+
+def load_data(version):
+    """Carrega os dados da planilha (Parquet, se houver), em cache por versão."""
+    return carregar_planilha(FILE_PATH, version)
 
 
 def show_dashboard():
     """Exibe o dashboard com os dados de pareceres conclusivos."""
     st.header("Produtos da meta 2.3")
-    df_pareceres = load_data()
+    st.caption(f"Dados: {rotulo_versao(FILE_PATH)}")
+    version = versao_planilha(FILE_PATH)
+    df_pareceres = load_data(version)
 
     assentamentos = ['Todos'] + sorted(list(df_pareceres['Assentamento'].unique()))
     tipos = ['Todos'] + sorted(list(df_pareceres['Tipo'].unique()))
@@ -35,90 +50,65 @@ def show_dashboard():
             key="parecer_tipo"
         )
 
-    # Aplicar filtros
-    if selected_assentamento != "Todos":
-        df_pareceres = df_pareceres[
-            df_pareceres['Assentamento'] == selected_assentamento
-        ]
-    if selected_tipo != "Todos":
-        df_pareceres = df_pareceres[df_pareceres['Tipo'] == selected_tipo]
+    # Progresso geral das metas (sem filtros): retrato publicado pelo backend
+    # ou, se ele for de outra versão da planilha, contado nos dados carregados
+    progresso = progresso_planilha(FILE_PATH, version, df_pareceres)
+
+    # Aplicar filtros (uma única máscara combinada)
+    df_pareceres = aplicar_filtros(df_pareceres, {
+        'Assentamento': selected_assentamento,
+        'Tipo': selected_tipo,
+    })
+
+    # Contagem de cada coluna das metas (uma única passada), usada nos
+    # cartões e no gráfico por tipo
+    contagens = {coluna: df_pareceres[coluna].value_counts()
+                 for coluna in dict.fromkeys(meta.coluna for meta in METAS_CARTOES)}
+    tipo_data = contagens['Tipo']
 
     # Métricas principais
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric(
-            "Padrão", 
-            df_pareceres[df_pareceres['Tipo'] == 'Padrão'].shape[0]
-        )
-    with col2:
-        st.metric(
-            "Desbloqueio", 
-            df_pareceres[df_pareceres['Tipo'] == 'Desbloqueio'].shape[0]
-        )
+    for coluna, meta in zip(st.columns(len(METAS_CARTOES)), METAS_CARTOES):
+        with coluna:
+            st.metric(CARTOES[meta.codigo],
+                      contar_realizado(contagens[meta.coluna], meta.condicao))
 
     # Barras de Progresso
     st.subheader("Progresso dos Pareceres")
-
-    # Calcular totais e percentuais para os pareceres de beneficiário em geral
-    padrao_total = len(df_pareceres[df_pareceres['Tipo'] == 'Padrão'])
-    total_padrao = 4239
-    percentual_padrao = (padrao_total / total_padrao) * 100
-
-    # Calcular totais e percentuais para Pareceres para desbloqueio
-    desbloqueio_total = len(df_pareceres[df_pareceres['Tipo'] == 'Desbloqueio'])
-    total_desbloqueio = 500
-    percentual_desbloqueio = (desbloqueio_total / total_desbloqueio) * 100
-
-    # Criar duas colunas para as barras de progresso
     col1, col2 = st.columns(2)
 
     with col1:
-        st.markdown("**2.3.1 Pareceres de beneficiário**")
-        st.progress(min(percentual_padrao/100, 1.0))
-        st.write(
-            f"{padrao_total} de {total_padrao} pareceres concluídos "
-            f"({percentual_padrao:.1f}%)"
-        )
+        barra_progresso(progresso, '2.3.1')
 
     with col2:
-        st.markdown("**2.3.2 Pareceres para desbloqueio**")
-        st.progress(min(percentual_desbloqueio/100, 1.0))
-        st.write(
-            f"{desbloqueio_total} de {total_desbloqueio} pareceres concluídos "
-            f"({percentual_desbloqueio:.1f}%)"
-        )
+        barra_progresso(progresso, '2.3.2')
 
     # Gráficos
     col1, col2 = st.columns(2)
 
     with col1:
         st.subheader("Distribuição por Tipo")
-        tipo_data = df_pareceres['Tipo'].value_counts()
-        fig_tipo = px.pie(
-            names=tipo_data.index,
-            values=tipo_data.values,
-            title='Distribuição por Tipo',
+        fig_tipo = figura_pizza(
+            tipo_data,
+            'Distribuição por Tipo',
             color_discrete_map={'Padrão': 'lightblue', 'Desbloqueio': 'coral'}
         )
-        st.plotly_chart(fig_tipo)
+        st.plotly_chart(fig_tipo, key="pareceres_tipo")
 
     with col2:
         st.subheader("Distribuição por Assentamento")
         assentamento_data = df_pareceres['Assentamento'].value_counts()
-        fig_assentamento = px.pie(
-            names=assentamento_data.index,
-            values=assentamento_data.values,
-            title='Distribuição por Assentamento'
-        )
-        st.plotly_chart(fig_assentamento)
+        fig_assentamento = figura_pizza(
+            assentamento_data, 'Distribuição por Assentamento')
+        st.plotly_chart(fig_assentamento, key="pareceres_assentamento")
 
     # Dados detalhados
     st.subheader("Relação de pareceres")
-    st.dataframe(
+    tabela_paginada(
         df_pareceres[[
-            'Lote', 'Assentamento', 'Município', 
+            'Lote', 'Assentamento', 'Município',
             'Código SIPRA', 'Tipo', 'Caminho'
-        ]]
+        ]],
+        'pareceres'
     )
 
 
@@ -1,23 +1,33 @@
 """Dashboard para visualização de produtos da meta 2.4 - Planilhas de monitoramento."""
 
-import pandas as pd
-import plotly.express as px
 import streamlit as st
 
+from carregador_dados import carregar_planilha, rotulo_versao, versao_planilha
+from filtros import aplicar_filtros
+from graficos import figura_pizza
+from progresso import barra_progresso, progresso_planilha
+from tabela import tabela_paginada
 
-@st.cache_data
-def load_data():
-    """Carrega os dados do arquivo Excel e armazena em cache."""
-    return pd.read_excel('05_contPlanilhas.xlsx')
+FILE_PATH = '05_contPlanilhas.xlsx'
+
+
+def prepare_data(data_planilhas):
+    """Limpa os nomes das colunas."""
+    data_planilhas.columns = data_planilhas.columns.str.strip()
+    return data_planilhas
+
+
+def load_data(version):
+    """Carrega os dados da planilha (Parquet, se houver), preparados uma vez por versão."""
+    return carregar_planilha(FILE_PATH, version, prepare_data)
 
 
 def show_dashboard():
     """Exibe o dashboard com os dados de planilhas de monitoramento."""
     st.header("Produto da meta 2.4")
-    data_planilhas = load_data()
-
-    # Limpeza dos nomes das colunas
-    data_planilhas.columns = data_planilhas.columns.str.strip()
+    st.caption(f"Dados: {rotulo_versao(FILE_PATH)}")
+    version = versao_planilha(FILE_PATH)
+    data_planilhas = load_data(version)
 
     # Cálculo dos totais
     total_municipios = data_planilhas['Município'].nunique()
@@ -35,26 +45,26 @@ def show_dashboard():
     with col2:
         st.metric("2.4.1 Total de planilhas de assentamento", total_assentamentos)
 
+    # Progresso da meta: retrato publicado pelo backend ou, se ele for de
+    # outra versão da planilha, contado nos dados carregados
+    barra_progresso(progresso_planilha(FILE_PATH, version, data_planilhas), '2.4.1')
+
     # Gráfico de pizza com planilhas por município
     st.header("Distribuição de Planilhas por Município")
 
-    planilhas_por_municipio = data_planilhas.groupby('Município').size().reset_index()
-    planilhas_por_municipio.columns = ['Município', 'Quantidade']
+    planilhas_por_municipio = data_planilhas.groupby('Município').size()
 
-    fig = px.pie(
-        planilhas_por_municipio, 
-        values='Quantidade', 
-        names='Município',
-        title='Distribuição de Planilhas por Município'
+    # Rótulos dentro das fatias para melhor visualização
+    fig = figura_pizza(
+        planilhas_por_municipio,
+        'Distribuição de Planilhas por Município',
+        tracos={'textposition': 'inside', 'textinfo': 'percent+label'}
     )
-
-    # Atualiza o layout para melhor visualização
-    fig.update_traces(textposition='inside', textinfo='percent+label')
-    st.plotly_chart(fig)
+    st.plotly_chart(fig, key="planilhas_municipio")
 
     # Tabela Completa
     st.header("Tabela Completa")
-    st.dataframe(data_planilhas)
+    tabela_paginada(data_planilhas, 'planilhas')
 
     # Filtro por município
     st.header("Filtrar por Município")
@@ -64,10 +74,9 @@ def show_dashboard():
     )
 
     if municipio_selecionado:
-        filtered_data = data_planilhas[
-            data_planilhas["Município"] == municipio_selecionado
-        ]
-        st.dataframe(filtered_data)
+        filtered_data = aplicar_filtros(
+            data_planilhas, {'Município': municipio_selecionado})
+        tabela_paginada(filtered_data, 'planilhas_municipio')
 
 
 if __name__ == "__main__":
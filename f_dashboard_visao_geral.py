@@ -0,0 +1,104 @@
+"""Dashboard com a visão geral do progresso de todas as metas (2.1 a 2.4)."""
+
+import pandas as pd
+import streamlit as st
+
+from carregador_dados import rotulo_versao
+from graficos import figura_evolucao
+from progresso import (ARQUIVO_PROGRESSO, JANELA_RITMO_DIAS, barra_progresso,
+                       carregar_historico, progresso_geral, projetar_conclusao,
+                       versao_historico)
+
+# Metas exibidas, na ordem do Plano de Trabalho
+GRUPOS = {
+    '2.1': 'Laudos',
+    '2.2': 'Documentação PGT',
+    '2.3': 'Pareceres conclusivos',
+    '2.4': 'Planilhas monitoramento',
+}
+
+
+def show_dashboard():
+    """Exibe o progresso de todas as metas, lido do retrato publicado se atualizado."""
+    st.header("Visão geral das metas")
+    progresso, do_retrato = progresso_geral()
+    if progresso is None:
+        st.info("O progresso das metas ainda não foi publicado pelo backend (código 06_1).")
+        return
+    if do_retrato:
+        st.caption(f"Dados: {rotulo_versao(ARQUIVO_PROGRESSO)}")
+    else:
+        st.caption("Dados: calculados das planilhas publicadas (retrato do código 06_1 "
+                   "ausente ou desatualizado)")
+
+    # Totais gerais
+    realizado, total = int(progresso['Realizado'].sum()), int(progresso['Total'].sum())
+    concluidas = int((progresso['Realizado'] >= progresso['Total']).sum())
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Produtos entregues", f"{realizado} de {total}")
+    with col2:
+        st.metric("Produtos com meta atingida", f"{concluidas} de {len(progresso)}")
+
+    # Uma barra por produto, agrupadas por meta
+    for meta, nome in GRUPOS.items():
+        codigos = [codigo for codigo in progresso.index if codigo.startswith(meta + '.')]
+        if not codigos:
+            continue
+        st.subheader(f"{meta} {nome}")
+        colunas = st.columns(2)
+        for i, codigo in enumerate(codigos):
+            with colunas[i % 2]:
+                barra_progresso(progresso, codigo)
+
+    mostrar_evolucao(progresso)
+
+
+def mostrar_evolucao(progresso):
+    """Evolução de cada meta e previsão de conclusão, lidas só do histórico."""
+    st.subheader("Evolução das metas")
+    historico = carregar_historico(versao_historico())
+    if historico.empty:
+        st.info("Ainda não há registros no histórico das metas.")
+        return
+
+    # Ritmo recente e previsão de conclusão de cada meta
+    series = {meta: grupo.set_index('Momento')['Realizado']
+              for meta, grupo in historico.groupby('Meta', sort=False)}
+    linhas, previsoes = [], {}
+    for codigo in progresso.index:
+        serie = series.get(codigo, pd.Series(dtype='int64'))
+        total = int(progresso.loc[codigo, 'Total'])
+        ritmo, previsao = projetar_conclusao(serie, total)
+        previsoes[codigo] = previsao
+        linhas.append({
+            'Meta': codigo,
+            'Descrição': progresso.loc[codigo, 'Descrição'],
+            'Registros': len(serie),
+            'Ritmo (por dia)': round(ritmo, 2) if ritmo is not None else None,
+            'Previsão de conclusão': (f"{previsao:%d/%m/%Y}" if previsao is not None
+                                      else "Sem previsão"),
+        })
+    st.dataframe(pd.DataFrame(linhas), hide_index=True)
+    st.caption(f"Ritmo estimado pelos registros dos últimos {JANELA_RITMO_DIAS} dias; "
+               "a previsão mantém esse ritmo até atingir o total.")
+
+    codigo = st.selectbox(
+        "Meta:",
+        list(progresso.index),
+        format_func=lambda c: f"{c} {progresso.loc[c, 'Descrição']}",
+        key="evolucao_meta"
+    )
+    serie = series.get(codigo, pd.Series(dtype='int64'))
+    total = int(progresso.loc[codigo, 'Total'])
+    fig = figura_evolucao(serie, total, previsoes[codigo], f"Evolução da meta {codigo}")
+    st.plotly_chart(fig, key="evolucao_meta_grafico")
+
+
+if __name__ == "__main__":
+    st.set_page_config(
+        page_title="Visão geral das metas",
+        page_icon="📊",
+        layout="wide"
+    )
+    show_dashboard()
@@ -0,0 +1,120 @@
+"""Filtros das abas do dashboard aplicados com uma única máscara booleana.
+
+Em vez de encadear `df = df[df[col] == valor]` (uma cópia por filtro), as
+seleções são combinadas em uma máscara e o resultado é copiado uma só vez.
+Para as colunas mais usadas, o índice guarda uma máscara pronta por valor,
+calculada uma vez por versão da planilha.
+
+Os DataFrames e índices em st.cache_resource são compartilhados entre
+sessões: as máscaras do índice são somente leitura e `aplicar_filtros`
+sempre retorna um DataFrame novo, que pode ser alterado sem afetar o cache.
+"""
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+TODOS = 'Todos'
+
+
+def somente_leitura(array):
+    """Marca um array guardado em cache como somente leitura e o retorna."""
+    array.setflags(write=False)
+    return array
+
+
+def construir_indice(df, colunas):
+    """Máscara booleana de cada valor das colunas indicadas.
+
+    Returns:
+        Dicionário {coluna: {valor: np.ndarray de bool}}
+    """
+    indice = {}
+    for coluna in colunas:
+        codigos, valores = pd.factorize(df[coluna])
+        indice[coluna] = {valor: somente_leitura(codigos == i)
+                          for i, valor in enumerate(valores)}
+    return indice
+
+
+@st.cache_resource(max_entries=16)
+def indice_cacheado(caminho, versao, colunas, _df):
+    """`construir_indice` guardado por arquivo e versão (o df não é hasheado)."""
+    return construir_indice(_df, colunas)
+
+
+def mascara(df, selecoes, indice=None):
+    """Máscara com as linhas que atendem a todas as seleções diferentes de 'Todos'."""
+    resultado = np.ones(len(df), dtype=bool)
+    for coluna, valor in selecoes.items():
+        if valor == TODOS:
+            continue
+        if indice is not None and coluna in indice:
+            mascara_valor = indice[coluna].get(valor)
+            if mascara_valor is None:
+                return np.zeros(len(df), dtype=bool)
+            resultado &= mascara_valor
+        else:
+            resultado &= (df[coluna] == valor).to_numpy(dtype=bool, na_value=False)
+    return resultado
+
+
+def indice_datas(datas):
+    """Ordem das linhas por data e as datas já ordenadas (datetime64).
+
+    Com ele, um período vira um recorte contínuo das datas ordenadas,
+    localizado por busca binária (ver `mascara_periodo`).
+    """
+    valores = datas.to_numpy(dtype='datetime64[ns]')
+    ordem = np.argsort(valores, kind='stable')
+    return somente_leitura(ordem), somente_leitura(valores[ordem])
+
+
+@st.cache_resource(max_entries=16)
+def indice_datas_cacheado(caminho, versao, coluna, _df):
+    """`indice_datas` da coluna guardado por arquivo e versão (o df não é hasheado)."""
+    return indice_datas(_df[coluna])
+
+
+def limites_periodo(indice, inicio, fim):
+    """Posições, nas datas ordenadas, do recorte entre `inicio` e `fim` (inclusive)."""
+    _, ordenadas = indice
+    primeiro = np.searchsorted(
+        ordenadas, np.datetime64(inicio, 'D').astype(ordenadas.dtype), side='left')
+    ultimo = np.searchsorted(
+        ordenadas, (np.datetime64(fim, 'D') + 1).astype(ordenadas.dtype), side='left')
+    return primeiro, max(primeiro, ultimo)
+
+
+def contar_periodo(indice, inicio, fim):
+    """Quantidade de linhas com data entre `inicio` e `fim`, sem montar a máscara."""
+    primeiro, ultimo = limites_periodo(indice, inicio, fim)
+    return ultimo - primeiro
+
+
+def mascara_periodo(indice, inicio, fim):
+    """Máscara das linhas com data entre `inicio` e `fim` (datas, inclusive).
+
+    Linhas sem data (NaT) ficam de fora, pois são ordenadas por último.
+    """
+    ordem, _ = indice
+    primeiro, ultimo = limites_periodo(indice, inicio, fim)
+    resultado = np.zeros(len(ordem), dtype=bool)
+    resultado[ordem[primeiro:ultimo]] = True
+    return resultado
+
+
+def aplicar_filtros(df, selecoes, indice=None, mascara_extra=None):
+    """Retorna as linhas de `df` que atendem às seleções ({coluna: valor}).
+
+    `mascara_extra` (ex.: a de um período) é combinada à das seleções.
+    Sem nenhum filtro ativo, retorna uma cópia rasa de `df`: os dados não
+    são copiados, mas, com o copy-on-write do pandas >= 3 (exigido em
+    requirements.txt), alterar o resultado não altera o `df` em cache (e
+    escrever direto nos arrays dele gera ValueError).
+    """
+    if mascara_extra is None:
+        if all(valor == TODOS for valor in selecoes.values()):
+            return df.copy(deep=False)
+        return df[mascara(df, selecoes, indice)]
+    return df[mascara(df, selecoes, indice) & mascara_extra]
@@ -0,0 +1,69 @@
+"""Gráficos Plotly compartilhados pelas abas do dashboard.
+
+As figuras são guardadas em cache pelo conteúdo das contagens (e pelas
+opções do gráfico): um rerun com os mesmos dados reaproveita a figura em
+vez de montá-la de novo. Pizzas com muitas fatias (ex.: por assentamento)
+mostram só as maiores e somam o restante em 'Outros', o que limita o
+tamanho de cada gráfico enviado ao navegador.
+"""
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+# Número máximo de fatias de uma pizza, contando a fatia 'Outros'
+LIMITE_FATIAS = 15
+
+
+def agrupar_outros(contagem, limite=LIMITE_FATIAS, rotulo='Outros'):
+    """Mantém as `limite` - 1 maiores contagens e soma as demais em `rotulo`.
+
+    Contagens com até `limite` valores são retornadas sem alteração.
+    """
+    if limite is None or len(contagem) <= limite:
+        return contagem
+    maiores = contagem.sort_values(ascending=False, kind='stable').iloc[:limite - 1]
+    outros = contagem.drop(maiores.index).sum()
+    return pd.concat([maiores, pd.Series([outros], index=[rotulo])])
+
+
+@st.cache_resource(max_entries=256)
+def figura_pizza(contagem, titulo=None, limite=LIMITE_FATIAS, tracos=None, **opcoes):
+    """Pizza das contagens (Series valor -> quantidade).
+
+    Args:
+        contagem: Series com os rótulos no índice e as quantidades nos valores
+        titulo: Título do gráfico
+        limite: Máximo de fatias (None para mostrar todas)
+        tracos: Opções repassadas a `update_traces` (ex.: textinfo)
+        **opcoes: Demais argumentos de `px.pie`
+    """
+    contagem = agrupar_outros(contagem, limite)
+    fig = px.pie(names=contagem.index, values=contagem.values, title=titulo, **opcoes)
+    if tracos:
+        fig.update_traces(**tracos)
+    return fig
+
+
+@st.cache_resource(max_entries=256)
+def figura_barras(contagem, titulo=None, **opcoes):
+    """Gráfico de barras das contagens (Series rótulo -> quantidade)."""
+    return px.bar(x=contagem.index, y=contagem.values, title=titulo, **opcoes)
+
+
+@st.cache_resource(max_entries=64)
+def figura_evolucao(serie, total, previsao=None, titulo=None):
+    """Realizado ao longo do tempo (Series data -> quantidade), com o total.
+
+    Se houver `previsao` (data em que o total deve ser atingido), o último
+    registro é ligado ao total por uma linha tracejada.
+    """
+    fig = go.Figure(go.Scatter(x=serie.index, y=serie.values,
+                               mode='lines+markers', name='Realizado'))
+    if previsao is not None and len(serie):
+        fig.add_trace(go.Scatter(x=[serie.index[-1], previsao], y=[serie.iloc[-1], total],
+                                 mode='lines', line={'dash': 'dash'}, name='Previsão'))
+    fig.add_hline(y=total, line_dash='dot', annotation_text=f"Total: {total}")
+    fig.update_layout(title=titulo, xaxis_title=None, yaxis_title='Realizado')
+    return fig
@@ -1,46 +1,58 @@
 """Dashboard Supervisão Ocupacional - TED INCRA/UFPR."""
 
+import importlib
+
 import streamlit as st
-from a_dashboard_laudos import show_dashboard as show_dashboard_laudos
-from b_dashboard_documentos import show_dashboard as show_dashboard_documentos
-from c_dashboard_docs_recebidos import show_dashboard as show_dashboard_docs_recebidos
-from d_dashboard_pareceres import show_dashboard as show_dashboard_pareceres
-from e_dashboard_planilhas import show_dashboard as show_dashboard_planilhas
+
+# Abas do dashboard e o módulo que exibe cada uma (função show_dashboard).
+# Só o módulo da aba selecionada é importado e executado a cada interação.
+ABAS = {
+    "Visão geral": "f_dashboard_visao_geral",
+    "2.1 Laudos": "a_dashboard_laudos",
+    "2.2 Documentação PGT": "b_dashboard_documentos",
+    "2.2.1.1 Documentos recebidos": "c_dashboard_docs_recebidos",
+    "2.3 Pareceres conclusivos": "d_dashboard_pareceres",
+    "2.4 Planilhas monitoramento": "e_dashboard_planilhas",
+}
+
+# Filtros do menu lateral de cada aba. O Streamlit apaga o valor dos
+# widgets que não são exibidos em uma execução, e o seletor de abas só
+# exibe a aba selecionada; reatribuir os valores no início de cada execução
+# mantém as seleções ao trocar de aba e voltar.
+FILTROS = (
+    'tecnico', 'municipio', 'assentamento', 'tipo_laudo', 'modalidade',
+    'codigo_sipra', 'start_date', 'end_date',
+    'tipo_documento_pgt_unique', 'assentamento_pgt_unique', 'municipio_pgt_unique',
+    'nome_t1_pgt_unique', 'objetivo_pgt_unique',
+    'municipio_docs', 'assentamento_docs', 'lote_docs',
+    'parecer_assentamento', 'parecer_tipo',
+)
+
+
+def manter_filtros():
+    """Mantém em st.session_state as seleções das abas que não estão visíveis."""
+    for chave in FILTROS:
+        if chave in st.session_state:
+            st.session_state[chave] = st.session_state[chave]
 
 
 def main():
     """Função principal que configura e exibe o dashboard."""
     st.title("Dashboard Supervisão Ocupacional - TED INCRA/UFPR")
-
-    # Criação das abas
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "2.1 Laudos",
-        "2.2 Documentação PGT",
-        "2.2.1.1 Documentos recebidos",
-        "2.3 Pareceres conclusivos",
-        "2.4 Planilhas monitoramento"
-    ])
-
-    # Configuração do menu lateral para cada aba
-    with tab1:
-        st.sidebar.title("Filtros - 2.1 Laudos")
-        show_dashboard_laudos()
-
-    with tab2:
-        st.sidebar.title("Filtros - 2.2 Documentação PGT")
-        show_dashboard_documentos()
-
-    with tab3:
-        st.sidebar.title("Filtros - 2.2.1.1 Documentos recebidos")
-        show_dashboard_docs_recebidos()
-
-    with tab4:
-        st.sidebar.title("Filtros - 2.3 Pareceres conclusivos")
-        show_dashboard_pareceres()
-
-    with tab5:
-        st.sidebar.title("Filtros - 2.4 Planilhas monitoramento")
-        show_dashboard_planilhas()
+    manter_filtros()
+
+    # Seletor de abas: diferente de st.tabs, apenas a aba visível é calculada
+    aba = st.radio(
+        "Aba:",
+        list(ABAS),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="aba"
+    )
+
+    # Configuração do menu lateral da aba selecionada
+    st.sidebar.title(f"Filtros - {aba}")
+    importlib.import_module(ABAS[aba]).show_dashboard()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,195 @@
+"""Progresso das metas (2.1.1 … 2.4.1) exibido nas abas do dashboard.
+
+O realizado de cada meta vem do retrato publicado pelo backend
+(06_progressoMetas.xlsx, uma linha por meta), e não das planilhas
+completas: as barras de progresso e a aba de visão geral leem só esse
+arquivo pequeno. O retrato só é usado para as metas de uma planilha se foi
+calculado sobre a mesma versão que o dashboard carregou; se ele não existe
+ou está desatualizado, o realizado é calculado aqui, com o cadastro de
+metas do backend (backend/metas.py), a partir dos dados que a aba já
+carregou (ou, na visão geral, das colunas das metas na planilha).
+
+A evolução das metas vem do histórico (06_historicoMetas/), em que cada
+execução do backend acrescenta um Parquet com o realizado de cada meta.
+Os arquivos nunca mudam depois de gravados, então a lista de nomes basta
+como versão do cache.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from carregador_dados import arquivo_publicado, carregar_planilha, versao_planilha
+# Cadastro de metas do backend (pasta incluída no sys.path por carregador_dados)
+from metas import METAS, calcular_progresso, ler_colunas
+
+ARQUIVO_PROGRESSO = '06_progressoMetas.xlsx'
+PASTA_HISTORICO = '06_historicoMetas'
+
+# Período mais recente usado para estimar o ritmo de cada meta
+JANELA_RITMO_DIAS = 90
+
+# Unidade exibida no texto das barras, pela meta do produto
+UNIDADES = {
+    '2.1': 'laudos',
+    '2.2': 'documentos',
+    '2.3': 'pareceres concluídos',
+    '2.4': 'planilhas',
+}
+
+# Planilhas publicadas que medem as metas, na ordem do cadastro
+PLANILHAS_METAS = list(dict.fromkeys(os.path.basename(meta.planilha) for meta in METAS))
+
+
+def carregar_progresso():
+    """Retrato de progresso indexado pelo código da meta, em cache por versão.
+
+    Retorna None enquanto o backend (código 06_1) não publicou o retrato.
+    """
+    if not os.path.exists(arquivo_publicado(ARQUIVO_PROGRESSO)):
+        return None
+    progresso = carregar_planilha(ARQUIVO_PROGRESSO, versao_planilha(ARQUIVO_PROGRESSO))
+    return progresso.astype({'Meta': str}).set_index('Meta')
+
+
+def metas_da_planilha(planilha):
+    """Metas medidas pela planilha publicada `planilha` (nome do arquivo)."""
+    return [meta for meta in METAS if os.path.basename(meta.planilha) == planilha]
+
+
+def retrato_atualizado(retrato, planilha, versao):
+    """Linhas do retrato com as metas de `planilha`, se contadas na mesma versão.
+
+    Returns:
+        DataFrame indexado pela meta ou None (retrato ausente, sem alguma
+        das metas ou calculado sobre outra versão da planilha)
+    """
+    if retrato is None or 'Versão' not in retrato.columns:
+        return None
+    codigos = [meta.codigo for meta in metas_da_planilha(planilha)]
+    if not set(codigos) <= set(retrato.index):
+        return None
+    linhas = retrato.loc[codigos]
+    return linhas if (linhas['Versão'] == versao[1]).all() else None
+
+
+@st.cache_data(max_entries=16)
+def calcular_da_planilha(planilha, versao, _df=None):
+    """Realizado das metas de `planilha`, calculado uma vez por versão.
+
+    Conta em `_df` (os dados já carregados pela aba, sem filtros) ou, sem
+    ele, lê só as colunas das metas na planilha publicada.
+    """
+    ler = ler_colunas if _df is None else (lambda caminho, colunas: _df)
+    progresso = calcular_progresso(lambda _: planilha, metas_da_planilha(planilha), ler)
+    return progresso.set_index('Meta')
+
+
+def progresso_planilha(planilha, versao, df=None):
+    """Progresso das metas medidas por `planilha`, indexado pelo código da meta.
+
+    Vem do retrato publicado se ele foi calculado sobre `versao`; senão é
+    calculado a partir de `df` (ver `calcular_da_planilha`).
+
+    Args:
+        planilha: Planilha da aba (ex.: '01_laudos_SO_infos.xlsx')
+        versao: Versão carregada pela aba (`versao_planilha(planilha)`)
+        df: Dados da planilha já carregados pela aba, sem filtros
+    """
+    retrato = retrato_atualizado(carregar_progresso(), planilha, versao)
+    return retrato if retrato is not None else calcular_da_planilha(planilha, versao, df)
+
+
+def progresso_geral():
+    """Progresso de todas as metas, como em `progresso_planilha`.
+
+    Planilhas que não estão publicadas no dashboard usam o retrato como
+    está (se houver).
+
+    Returns:
+        Tupla (DataFrame indexado pela meta, True se tudo veio do retrato)
+    """
+    retrato = carregar_progresso()
+    partes, do_retrato = [], True
+    for planilha in PLANILHAS_METAS:
+        if os.path.exists(arquivo_publicado(planilha)):
+            versao = versao_planilha(planilha)
+            parte = retrato_atualizado(retrato, planilha, versao)
+            if parte is None:
+                parte, do_retrato = calcular_da_planilha(planilha, versao), False
+        elif retrato is not None:
+            parte = retrato[retrato['Planilha'] == planilha]
+        else:
+            continue
+        partes.append(parte)
+    if not partes:
+        return None, False
+    return pd.concat(partes), do_retrato
+
+
+def barra_progresso(progresso, codigo):
+    """Exibe título, barra e texto 'X de Y <unidade> (p%)' de uma meta."""
+    if progresso is None or codigo not in progresso.index:
+        st.info(f"{codigo}: progresso ainda não publicado pelo backend (código 06_1).")
+        return
+    meta = progresso.loc[codigo]
+    realizado, total = int(meta['Realizado']), int(meta['Total'])
+    percentual = (realizado / total) * 100
+    unidade = UNIDADES[codigo.rsplit('.', 1)[0]]
+
+    st.markdown(f"**{codigo} {meta['Descrição']}**")
+    st.progress(min(percentual/100, 1.0))
+    st.write(f"{realizado} de {total} {unidade} ({percentual:.1f}%)")
+
+
+def versao_historico():
+    """Nomes dos registros do histórico, em ordem (vazio se não houver)."""
+    if not os.path.isdir(PASTA_HISTORICO):
+        return ()
+    return tuple(sorted(nome for nome in os.listdir(PASTA_HISTORICO)
+                        if nome.endswith('.parquet')))
+
+
+@st.cache_data(max_entries=2)
+def carregar_historico(versao):
+    """Histórico (Momento, Meta, Realizado, Total) dos registros em `versao`."""
+    if not versao:
+        return pd.DataFrame(columns=['Momento', 'Meta', 'Realizado', 'Total'])
+    historico = pd.concat(
+        [pd.read_parquet(os.path.join(PASTA_HISTORICO, nome)) for nome in versao],
+        ignore_index=True)
+    return historico.sort_values(['Meta', 'Momento'], kind='stable', ignore_index=True)
+
+
+def projetar_conclusao(serie, total, janela_dias=JANELA_RITMO_DIAS):
+    """Ritmo recente de uma meta e data prevista para atingir o total.
+
+    O ritmo é a inclinação da reta ajustada aos registros dos últimos
+    `janela_dias` dias; a previsão prolonga essa reta a partir do último
+    registro. Metas já atingidas retornam a data do primeiro registro que
+    atingiu o total.
+
+    Args:
+        serie: Series Momento -> Realizado, em ordem cronológica
+        total: Total a atingir
+
+    Returns:
+        Tupla (ritmo por dia ou None, data prevista ou None)
+    """
+    if serie.empty:
+        return None, None
+    atingidos = serie[serie >= total]
+    if not atingidos.empty:
+        return None, atingidos.index[0]
+
+    recentes = serie[serie.index >= serie.index[-1] - pd.Timedelta(days=janela_dias)]
+    dias = (recentes.index - recentes.index[0]) / pd.Timedelta(days=1)
+    if len(recentes) < 2 or dias[-1] <= 0:
+        return None, None
+    ritmo = float(np.polyfit(np.asarray(dias, dtype=float), recentes.to_numpy(dtype=float), 1)[0])
+    if ritmo <= 0:
+        return ritmo, None
+    faltam = (total - serie.iloc[-1]) / ritmo
+    return ritmo, (serie.index[-1] + pd.Timedelta(days=faltam)).floor('s')
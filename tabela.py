@@ -0,0 +1,73 @@
+"""Tabela paginada usada nas relações de documentos do dashboard.
+
+A busca, a ordenação e o recorte da página são feitos aqui, no servidor;
+somente as linhas da página visível são enviadas ao navegador, em vez do
+DataFrame filtrado inteiro.
+"""
+
+import math
+
+import streamlit as st
+
+SEM_ORDENACAO = '(ordem original)'
+
+
+def buscar(df, texto):
+    """Linhas de `df` em que alguma coluna contém `texto` (sem diferenciar maiúsculas)."""
+    texto = texto.strip()
+    if not texto:
+        return df
+    encontrado = None
+    for coluna in df.columns:
+        contem = df[coluna].astype(str).str.contains(
+            texto, case=False, regex=False).to_numpy(dtype=bool, na_value=False)
+        encontrado = contem if encontrado is None else encontrado | contem
+    return df if encontrado is None else df[encontrado]
+
+
+def ordenar(df, coluna, decrescente=False):
+    """`df` ordenado pela coluna (ordenação estável, vazios por último)."""
+    if coluna == SEM_ORDENACAO:
+        return df
+    try:
+        return df.sort_values(
+            coluna, ascending=not decrescente, kind='stable', na_position='last')
+    except TypeError:
+        # Colunas com tipos misturados (ex.: números e textos) viram texto
+        return df.sort_values(
+            coluna, ascending=not decrescente, kind='stable', na_position='last',
+            key=lambda valores: valores.astype(str))
+
+
+def tabela_paginada(df, chave, linhas_por_pagina=50):
+    """Exibe `df` em páginas, com campo de busca e ordenação por coluna.
+
+    Args:
+        df: DataFrame a exibir (já filtrado pela aba)
+        chave: Prefixo único das chaves dos widgets da tabela
+        linhas_por_pagina: Quantidade de linhas por página
+    """
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        texto = st.text_input("Buscar:", key=f"{chave}_busca")
+    with col2:
+        coluna = st.selectbox(
+            "Ordenar por:", [SEM_ORDENACAO] + list(df.columns), key=f"{chave}_ordem")
+    with col3:
+        decrescente = st.checkbox("Decrescente", key=f"{chave}_decrescente")
+    with col4:
+        pagina = st.number_input(
+            "Página:", min_value=1, step=1, key=f"{chave}_pagina")
+
+    df = ordenar(buscar(df, texto), coluna, decrescente)
+
+    total = len(df)
+    paginas = max(1, math.ceil(total / linhas_por_pagina))
+    pagina = min(int(pagina), paginas)
+    inicio = (pagina - 1) * linhas_por_pagina
+    fim = min(inicio + linhas_por_pagina, total)
+
+    st.dataframe(df.iloc[inicio:fim])
+    st.caption(
+        f"Linhas {inicio + 1 if total else 0}–{fim} de {total} "
+        f"(página {pagina} de {paginas})")
@@ -0,0 +1,55 @@
+"""Carregamento das abas: preparo uma vez por versão, com a mesma chave em todas."""
+
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from carregador_dados import carregar_planilha, versao_planilha  # noqa: E402
+
+CHAMADAS = []
+
+
+def maiusculas(df):
+    CHAMADAS.append('maiusculas')
+    df['Nome'] = df['Nome'].str.upper()
+    return df
+
+
+def minusculas(df):
+    CHAMADAS.append('minusculas')
+    df['Nome'] = df['Nome'].str.lower()
+    return df
+
+
+def test_preparo_em_cache_por_versao(tmp_path):
+    planilha = str(tmp_path / 'dados.xlsx')
+    pd.DataFrame({'Nome': ['Ana']}).to_parquet(str(tmp_path / 'dados.parquet'))
+    versao = versao_planilha(planilha)
+    CHAMADAS.clear()
+
+    assert carregar_planilha(planilha, versao, maiusculas)['Nome'].tolist() == ['ANA']
+    assert carregar_planilha(planilha, versao, maiusculas)['Nome'].tolist() == ['ANA']
+    assert carregar_planilha(planilha, versao, minusculas)['Nome'].tolist() == ['ana']
+    assert carregar_planilha(planilha, versao)['Nome'].tolist() == ['Ana']
+    assert CHAMADAS == ['maiusculas', 'minusculas']
+
+    # Nova versão do arquivo: preparada de novo
+    pd.DataFrame({'Nome': ['Bia']}).to_parquet(str(tmp_path / 'dados.parquet'))
+    nova = versao_planilha(planilha)
+    assert nova != versao
+    assert carregar_planilha(planilha, nova, maiusculas)['Nome'].tolist() == ['BIA']
+    assert CHAMADAS == ['maiusculas', 'minusculas', 'maiusculas']
+
+
+def test_compartilhada_retorna_o_mesmo_objeto(tmp_path):
+    planilha = str(tmp_path / 'dados.xlsx')
+    pd.DataFrame({'Nome': ['Ana']}).to_parquet(str(tmp_path / 'dados.parquet'))
+    versao = versao_planilha(planilha)
+
+    copia = carregar_planilha(planilha, versao, maiusculas)
+    assert copia is not carregar_planilha(planilha, versao, maiusculas)
+    compartilhada = carregar_planilha(planilha, versao, maiusculas, compartilhada=True)
+    assert compartilhada is carregar_planilha(planilha, versao, maiusculas, compartilhada=True)
@@ -0,0 +1,69 @@
+"""Cache de extração: dados de chaves que deixaram de ser usadas são apagados."""
+
+import os
+import sys
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.append(BACKEND)
+
+from extracao_pdf import CacheExtracao  # noqa: E402
+
+
+def escrever(caminho, conteudo, mtime_ns):
+    with open(caminho, 'wb') as f:
+        f.write(conteudo)
+    os.utime(caminho, ns=(mtime_ns, mtime_ns))
+
+
+def linhas(cache, tabela):
+    return cache.conexao.execute(f"SELECT COUNT(*) FROM {tabela}").fetchone()[0]
+
+
+def test_pdf_alterado_apaga_dados_da_chave_anterior(tmp_path):
+    pdf = tmp_path / 'laudo.pdf'
+    escrever(pdf, b'versao 1', 1_000_000_000)
+    with CacheExtracao(str(tmp_path / 'cache.sqlite')) as cache:
+        chave = cache.chave_documento(str(pdf))
+        cache.salvar_texto(chave, 0, 'texto antigo')
+        cache.salvar_campo(chave, 'data', '01/01/2025')
+
+        escrever(pdf, b'versao 2 maior', 2_000_000_000)
+        nova = cache.chave_documento(str(pdf))
+        assert nova != chave
+        assert cache.obter_texto(chave, 0) is None
+        assert linhas(cache, 'paginas') == 0
+        assert linhas(cache, 'campos') == 0
+
+
+def test_renomeacao_mantem_os_dados_sem_reler(tmp_path):
+    origem, destino = tmp_path / 'SOLICITACAO_1.pdf', tmp_path / 'PA_X_1.pdf'
+    escrever(origem, b'conteudo', 1_000_000_000)
+    with CacheExtracao(str(tmp_path / 'cache.sqlite')) as cache:
+        chave = cache.chave_documento(str(origem))
+        cache.salvar_texto(chave, 0, 'texto')
+        os.rename(origem, destino)
+        cache.registrar_renomeacao(str(origem), str(destino))
+
+        assert cache.chave_documento(str(destino)) == chave
+        assert cache.podar(str(tmp_path)) == 0
+        assert cache.obter_texto(chave, 0) == 'texto'
+        assert linhas(cache, 'arquivos') == 1
+
+
+def test_podar_remove_so_arquivos_ausentes_da_pasta(tmp_path):
+    pasta, outra = tmp_path / 'pasta', tmp_path / 'outra'
+    pasta.mkdir()
+    outra.mkdir()
+    removido, mantido, fora = pasta / 'a.pdf', pasta / 'b.pdf', outra / 'c.pdf'
+    for pdf in (removido, mantido, fora):
+        escrever(pdf, pdf.name.encode(), 1_000_000_000)
+    with CacheExtracao(str(tmp_path / 'cache.sqlite')) as cache:
+        for pdf in (removido, mantido, fora):
+            cache.salvar_texto(cache.chave_documento(str(pdf)), 0, pdf.name)
+        os.remove(removido)
+        os.remove(fora)
+
+        assert cache.podar(str(pasta)) == 1
+        assert linhas(cache, 'arquivos') == 2
+        assert sorted(texto for (texto,) in cache.conexao.execute(
+            "SELECT texto FROM paginas")) == ['b.pdf', 'c.pdf']
@@ -0,0 +1,71 @@
+"""Filtros sobre DataFrames em cache: o resultado nunca altera o original."""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+
+from filtros import (TODOS, aplicar_filtros, construir_indice,  # noqa: E402
+                     indice_datas, mascara_periodo)
+
+
+def dados():
+    return pd.DataFrame({
+        'Município': pd.Categorical(['CASCAVEL', 'TAMARANA', 'CASCAVEL']),
+        'Data': pd.to_datetime(['05/01/2025', '10/02/2025', '15/03/2025'], format='%d/%m/%Y'),
+        'Quantidade': [1, 2, 3],
+    })
+
+
+def test_sem_filtro_retorna_dataframe_novo():
+    df = dados()
+    filtrado = aplicar_filtros(df, {'Município': TODOS})
+    assert filtrado is not df
+    pd.testing.assert_frame_equal(filtrado, df)
+
+    filtrado.loc[0, 'Quantidade'] = 99
+    filtrado['Nova'] = 1
+    assert df['Quantidade'].tolist() == [1, 2, 3]
+    assert 'Nova' not in df.columns
+
+
+def test_copia_rasa_protegida_pelo_copy_on_write():
+    """A cópia rasa de `aplicar_filtros` depende do copy-on-write (pandas >= 3)."""
+    df = pd.DataFrame({'Quantidade': [1, 2, 3]})
+    copia = df.copy(deep=False)
+    copia.loc[0, 'Quantidade'] = 99
+    assert df['Quantidade'].tolist() == [1, 2, 3]
+
+    with open(os.path.join(RAIZ, 'requirements.txt')) as f:
+        assert 'pandas>=3' in f.read().split()
+
+
+def test_escrever_nos_arrays_do_resultado_gera_erro():
+    df = dados()
+    filtrado = aplicar_filtros(df, {'Município': TODOS})
+    with pytest.raises(ValueError):
+        filtrado['Quantidade'].to_numpy()[0] = 99
+    assert df['Quantidade'].tolist() == [1, 2, 3]
+
+
+def test_indices_em_cache_sao_somente_leitura():
+    df = dados()
+    indice = construir_indice(df, ['Município'])
+    with pytest.raises(ValueError):
+        indice['Município']['CASCAVEL'][0] = False
+    ordem, ordenadas = indice_datas(df['Data'])
+    with pytest.raises(ValueError):
+        ordem[0] = 2
+    with pytest.raises(ValueError):
+        ordenadas[0] = np.datetime64('2000-01-01')
+
+    periodo = mascara_periodo((ordem, ordenadas), pd.Timestamp('2025-02-01').date(),
+                              pd.Timestamp('2025-03-31').date())
+    filtrado = aplicar_filtros(df, {'Município': 'CASCAVEL'}, indice, periodo)
+    assert filtrado['Quantidade'].tolist() == [3]
+    assert indice['Município']['CASCAVEL'].tolist() == [True, False, True]
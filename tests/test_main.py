@@ -0,0 +1,28 @@
+"""Navegação entre abas: as seleções do menu lateral são mantidas."""
+
+import datetime
+import os
+
+from streamlit.testing.v1 import AppTest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_filtros_mantidos_ao_trocar_de_aba(monkeypatch):
+    monkeypatch.chdir(RAIZ)
+    at = AppTest.from_file(os.path.join(RAIZ, 'main.py'), default_timeout=120)
+    at.session_state['aba'] = '2.1 Laudos'
+    at.run()
+    at.selectbox(key='municipio').select('DIAMANTE DO OESTE').run()
+    at.date_input(key='start_date').set_value(datetime.date(2023, 1, 1)).run()
+
+    at.radio(key='aba').set_value('2.3 Pareceres conclusivos').run()
+    at.selectbox(key='parecer_tipo').select('Desbloqueio').run()
+    at.radio(key='aba').set_value('2.1 Laudos').run()
+
+    assert not at.exception
+    assert at.selectbox(key='municipio').value == 'DIAMANTE DO OESTE'
+    assert at.date_input(key='start_date').value == datetime.date(2023, 1, 1)
+
+    at.radio(key='aba').set_value('2.3 Pareceres conclusivos').run()
+    assert at.selectbox(key='parecer_tipo').value == 'Desbloqueio'
@@ -0,0 +1,67 @@
+"""Barras de progresso: retrato do backend só se for da versão carregada."""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+
+from carregador_dados import versao_planilha  # noqa: E402
+from metas import METAS, calcular_progresso  # noqa: E402
+from progresso import UNIDADES, retrato_atualizado  # noqa: E402
+
+ABAS = ['2.1 Laudos', '2.2 Documentação PGT', '2.3 Pareceres conclusivos',
+        '2.4 Planilhas monitoramento', 'Visão geral']
+
+
+def texto_barra(linha):
+    realizado, total = int(linha['Realizado']), int(linha['Total'])
+    unidade = UNIDADES[linha.name.rsplit('.', 1)[0]]
+    return f"{realizado} de {total} {unidade} ({realizado / total * 100:.1f}%)"
+
+
+@pytest.fixture
+def esperado(monkeypatch):
+    monkeypatch.chdir(RAIZ)
+    return calcular_progresso(os.path.basename).set_index('Meta')
+
+
+@pytest.mark.parametrize('aba', ABAS)
+def test_barras_calculadas_sem_retrato(esperado, aba):
+    at = AppTest.from_file(os.path.join(RAIZ, 'main.py'), default_timeout=120)
+    at.session_state['aba'] = aba
+    at.run()
+
+    assert not at.exception
+    assert not [info for info in at.info if 'progresso ainda não publicado' in info.value]
+    textos = {markdown.value for markdown in at.markdown}
+    codigos = [codigo for codigo in esperado.index if f"**{codigo} " in
+               ' '.join(textos)]
+    assert codigos
+    for codigo in codigos:
+        assert texto_barra(esperado.loc[codigo]) in textos
+
+
+def test_retrato_usado_so_na_mesma_versao(esperado):
+    planilha = '04_contPareceres.xlsx'
+    versao = versao_planilha(planilha)
+    retrato = esperado.assign(Realizado=1)
+
+    atualizado = retrato_atualizado(retrato, planilha, versao)
+    assert list(atualizado.index) == ['2.3.1', '2.3.2']
+    assert (atualizado['Realizado'] == 1).all()
+
+    antigo = retrato.assign(**{'Versão': 'outra'})
+    assert retrato_atualizado(antigo, planilha, versao) is None
+    assert retrato_atualizado(retrato.drop(columns='Versão'), planilha, versao) is None
+    assert retrato_atualizado(retrato.drop(index='2.3.2'), planilha, versao) is None
+    assert retrato_atualizado(None, planilha, versao) is None
+
+
+def test_retrato_conta_as_planilhas_publicadas(esperado):
+    for planilha in dict.fromkeys(os.path.basename(meta.planilha) for meta in METAS):
+        assert retrato_atualizado(esperado, planilha, versao_planilha(planilha)) is not None
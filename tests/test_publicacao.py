@@ -0,0 +1,49 @@
+"""Backend e dashboard usam as mesmas funções para os arquivos publicados."""
+
+import os
+import sys
+
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(RAIZ)
+
+import carregador_dados  # noqa: E402
+import cubo  # noqa: E402
+import publicacao  # noqa: E402
+from a_dashboard_laudos import CUBE_DIMENSIONS, CUBE_MONTHLY_COLUMNS  # noqa: E402
+
+
+def test_dashboard_usa_as_funcoes_do_backend():
+    assert carregador_dados.caminho_parquet is publicacao.caminho_parquet
+    assert cubo.caminho_cubo is publicacao.caminho_cubo
+    assert cubo.montar_cubo is publicacao.montar_cubo
+
+
+def test_dashboard_le_o_que_o_backend_publica(tmp_path):
+    planilha = str(tmp_path / '01_laudos.xlsx')
+    pd.DataFrame({
+        'Município': ['CASCAVEL', 'CASCAVEL', 'TAMARANA', None],
+        'Data': ['05/01/2025', '20/01/2025', '10/02/2025', '11/02/2025'],
+    }).to_excel(planilha, index=False)
+    dimensoes, mensais = ['Município', 'Data'], ['Data']
+
+    assert publicacao.publicar_parquet(planilha, dimensoes, mensais) == \
+        carregador_dados.caminho_parquet(planilha)
+    publicado = pd.read_parquet(cubo.caminho_cubo(planilha))
+    assert publicado['Data'].tolist() == ['01/01/2025', '01/02/2025', '01/02/2025']
+    assert publicado['Quantidade'].tolist() == [2, 1, 1]
+
+    # O cubo lido é o publicado, e montá-lo no dashboard dá o mesmo cubo
+    pd.testing.assert_frame_equal(cubo.ler_cubo(planilha, dimensoes, mensais), publicado)
+    os.remove(cubo.caminho_cubo(planilha))
+    pd.testing.assert_frame_equal(cubo.ler_cubo(planilha, dimensoes, mensais), publicado)
+
+
+def test_cubo_dos_laudos_publicado_confere_com_a_planilha(monkeypatch):
+    monkeypatch.chdir(RAIZ)
+    planilha = '01_laudos_SO_infos.xlsx'
+    publicado = pd.read_parquet(cubo.caminho_cubo(planilha))
+    montado = cubo.montar_cubo(
+        carregador_dados.ler_planilha(planilha), CUBE_DIMENSIONS, CUBE_MONTHLY_COLUMNS)
+    pd.testing.assert_frame_equal(publicado, montado)
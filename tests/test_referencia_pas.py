@@ -0,0 +1,56 @@
+"""Busca exata da tabela de referência: nomes repetidos resolvidos como antes."""
+
+import importlib.util
+import os
+import sys
+
+import pandas as pd
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.append(BACKEND)
+
+from referencia_pas import ReferenciaPAs  # noqa: E402
+
+CSV_REFERENCIA = os.path.join(BACKEND, 'codsipraPAsMunicipiosNomePAs.csv')
+
+
+def test_nome_repetido_usa_a_ultima_linha():
+    referencia = ReferenciaPAs(pd.DataFrame({
+        'Codsipra': ['PR0081000', 'PR0216000'],
+        'Assentamento': ['SANTA MARIA', 'SANTA MARIA'],
+        'Município': ['PARANACITY', 'TAMARANA'],
+        'nomePA': ['PASANTAMARIA', 'PASANTAMARIA'],
+    }))
+    assert referencia.municipio('SANTA MARIA') == 'TAMARANA'
+    assert referencia.codsipra('SANTA MARIA') == 'PR0216000'
+    assert referencia.buscar('SANTA MARIA', 'PARANACITY')['Codsipra'] == 'PR0081000'
+
+
+def test_busca_igual_ao_dicionario_dos_scripts():
+    df = pd.read_csv(CSV_REFERENCIA)
+    referencia = ReferenciaPAs(df)
+    municipios = dict(zip(df['Assentamento'], df['Município']))
+    codsipras = dict(zip(df['Assentamento'], df['Codsipra']))
+    for assentamento in municipios:
+        assert referencia.municipio(assentamento) == municipios[assentamento]
+        assert referencia.codsipra(assentamento) == codsipras[assentamento]
+
+
+def carregar_script(pasta, nome):
+    spec = importlib.util.spec_from_file_location(nome, os.path.join(BACKEND, pasta, nome + '.py'))
+    modulo = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(modulo)
+    return modulo
+
+
+def test_pareceres_usam_a_primeira_linha():
+    pareceres = carregar_script('04_SO', '04_1_quantificadorPareceres')
+    referencia = ReferenciaPAs(pd.read_csv(CSV_REFERENCIA))
+    assert pareceres.get_assentamento_info('PARECER_PASANTA MARIA_L01.pdf', referencia) == (
+        'SANTA MARIA', 'PARANACITY', 'PR0081000')
+
+
+def test_planilhas_usam_a_primeira_linha_do_nome_pa():
+    referencia = ReferenciaPAs(pd.read_csv(CSV_REFERENCIA))
+    assert referencia.buscar_nome_pa('PASANTAMARIA')['Codsipra'] == 'PR0081000'
+    assert referencia.buscar_nome_pa('PASANTAMARIA', 'TAMARANA')['Codsipra'] == 'PR0216000'
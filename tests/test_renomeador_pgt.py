@@ -0,0 +1,146 @@
+"""Leitura parcial dos PDFs no renomeador 02_1: mesmos nomes do texto completo."""
+
+import importlib.util
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend')
+sys.path.append(BACKEND)
+
+from extracao_pdf import DocumentoPDF  # noqa: E402
+
+spec = importlib.util.spec_from_file_location(
+    'renomeador', os.path.join(BACKEND, '02_SO', '02_1_renomeador_docsPGTWEB.py'))
+renomeador = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(renomeador)
+
+
+class DocumentoFalso(DocumentoPDF):
+    """DocumentoPDF com o texto de cada página informado, sem arquivo."""
+
+    def __init__(self, paginas):
+        super().__init__('falso.pdf')
+        self.paginas = paginas
+
+    def _obter_reader(self):
+        return SimpleNamespace(pages=[SimpleNamespace(extract_text=lambda t=texto: t)
+                                      for texto in self.paginas])
+
+
+def preencher(paginas, total=9):
+    """Completa o documento com páginas sem os campos procurados."""
+    return paginas + ['texto sem campos relevantes\n'] * (total - len(paginas))
+
+
+ANALISE = 'Projeto de Assentamento: PA SANTA MARIA Processo Administrativo (SEI) '
+CONFORMIDADES = ('Projeto Assentamento: 123 - PA ESPERANCA Processo administrativo (SEI) '
+                 'Nome: Joao assinado em 01/02/2024 10:11:12 ')
+
+DOCUMENTOS = {
+    'analise no fim': (
+        'ANALISE_RO_1.pdf', 'analise',
+        preencher(['capa\n'] * 7 + [ANALISE, 'Nome Completo: Maria ']),
+    ),
+    'analise no início': (
+        'ANALISE_RO_2.pdf', 'analise',
+        preencher([ANALISE + 'Nome Completo: Ana ', 'Nome Completo: Outra ']),
+    ),
+    'assentamento entre páginas': (
+        'ANALISE_RO_3.pdf', 'analise',
+        preencher(['Nome Completo: Jose Projeto de Assentamento: PA SANTA ',
+                   'MARIA Processo Administrativo (SEI) ']),
+    ),
+    'titulação antes de regularização': (
+        'RELATORIO_CONFORMIDADES_1.pdf', 'conformidades',
+        preencher(['Solicitação de Titulação de Assentamento ' + CONFORMIDADES,
+                   'anexo\n', 'Solicitação de Regularização de Ocupantes em Assentamentos']),
+    ),
+    'conformidades completo na primeira página': (
+        'RELATORIO_CONFORMIDADES_2.pdf', 'conformidades',
+        preencher(['Solicitação de Regularização de Ocupantes em Assentamentos '
+                   + CONFORMIDADES]),
+    ),
+    'solicitação com padrão alternativo antes': (
+        'SOLICITACAO_DOCUMENTACAO_COMPLEMENTAR_1.pdf', 'solicitacao',
+        preencher(['Projeto de Assentamento NOVA VIDA , Pedro Paulo Silva\n', 'anexo\n',
+                   'PA BOA ESPERANCA, Sr. Carlos\n']),
+    ),
+    'solicitação sem campos': (
+        'SOLICITACAO_DOCUMENTACAO_COMPLEMENTAR_2.pdf', 'solicitacao',
+        preencher([]),
+    ),
+}
+
+
+def nomes(nome_arquivo, proposito, texto):
+    """Nome novo, data e PA que o 02_1 obtém do texto."""
+    if proposito == 'analise':
+        novo = renomeador.rename_analise_regularizacao(nome_arquivo, texto)
+    elif proposito == 'conformidades':
+        novo = renomeador.rename_relatorio_conformidades(nome_arquivo, texto)
+    else:
+        novo = renomeador.rename_solicitacao_documentacao(nome_arquivo, texto)
+    return novo, renomeador.extract_date_from_text(texto)
+
+
+@pytest.mark.parametrize('caso', list(DOCUMENTOS))
+def test_leitura_parcial_gera_os_mesmos_nomes(caso):
+    nome_arquivo, proposito, paginas = DOCUMENTOS[caso]
+    completo = ''.join(paginas)
+
+    documento = DocumentoFalso(paginas)
+    parcial = documento.texto_parcial(
+        renomeador.REQUIRED_PATTERNS[proposito], renomeador.PAGE_BUDGET)
+    assert nomes(nome_arquivo, proposito, parcial) == nomes(nome_arquivo, proposito, completo)
+
+    parcial = documento.texto_parcial(renomeador.REQUIRED_PATTERNS['data'])
+    assert renomeador.extract_date_from_text(parcial) == \
+        renomeador.extract_date_from_text(completo)
+
+    parcial = documento.texto_parcial(renomeador.REQUIRED_PATTERNS['pa'])
+    assert renomeador.find_pa_name_in_text(parcial) == renomeador.find_pa_name_in_text(completo)
+
+
+def paginacoes(texto, passo=3):
+    """O texto dividido em duas e em três páginas, de todas as formas (a cada `passo`)."""
+    for i in range(1, len(texto)):
+        yield preencher([texto[:i], texto[i:]], 4)
+    for i in range(1, len(texto), passo):
+        for j in range(i + 1, len(texto), passo):
+            yield preencher([texto[:i], texto[i:j], texto[j:]], 5)
+
+
+def ocorrencia(padrao, texto):
+    """Posição e grupos da primeira ocorrência do padrão (ou None)."""
+    encontrado = padrao.search(texto)
+    return encontrado and (encontrado.span(), encontrado.groups())
+
+
+@pytest.mark.parametrize('proposito', list(renomeador.REQUIRED_PATTERNS))
+def test_padroes_exigidos_encontram_o_mesmo_no_texto_parcial(proposito):
+    """A hipótese de `texto_parcial` vale para os padrões do 02_1.
+
+    Para cada padrão exigido, a primeira ocorrência no texto parcial é a
+    mesma do texto completo, com os textos dos casos acima divididos em
+    páginas em todas as posições.
+    """
+    padroes = renomeador.REQUIRED_PATTERNS[proposito]
+    sem_campos = preencher([], 1)[0]
+    for _, _, paginas in DOCUMENTOS.values():
+        texto = ''.join(pagina for pagina in paginas if pagina != sem_campos)
+        for divisao in paginacoes(texto):
+            completo = ''.join(divisao)
+            parcial = DocumentoFalso(divisao).texto_parcial(padroes)
+            for padrao in padroes:
+                assert ocorrencia(padrao, parcial) == ocorrencia(padrao, completo), \
+                    (padrao.pattern, divisao)
+
+
+def test_para_de_ler_quando_os_campos_aparecem():
+    _, proposito, paginas = DOCUMENTOS['analise no início']
+    documento = DocumentoFalso(paginas)
+    documento.texto_parcial(renomeador.REQUIRED_PATTERNS[proposito])
+    assert sorted(documento._textos) == [0, 1]
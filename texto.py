@@ -0,0 +1,35 @@
+"""Normalização de textos (nomes de municípios e assentamentos) do dashboard."""
+
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+def remove_special_chars(text):
+    """Remove caracteres especiais e acentos de um texto."""
+    if not isinstance(text, str):
+        return text  # Retorna o valor original se não for uma string
+    return ''.join(ch for ch in unicodedata.normalize('NFKD', text)
+                   if not unicodedata.combining(ch))
+
+
+def remover_acentos(serie):
+    """Aplica `remove_special_chars` a uma coluna, uma vez por valor distinto.
+
+    Os valores são fatorados (factorize), só os distintos são normalizados
+    e o resultado é expandido de volta pelas posições (take); o custo passa
+    a depender do número de nomes, não do número de linhas. Valores vazios
+    são mantidos.
+    """
+    codigos, unicos = pd.factorize(serie)
+    limpos = np.array([remove_special_chars(valor) for valor in unicos], dtype=object)
+
+    valores = serie.to_numpy(dtype=object, copy=True)
+    validos = codigos >= 0
+    valores[validos] = limpos.take(codigos[validos])
+
+    resultado = pd.Series(valores, index=serie.index, name=serie.name)
+    if isinstance(serie.dtype, pd.StringDtype):
+        resultado = resultado.astype(serie.dtype)
+    return resultado